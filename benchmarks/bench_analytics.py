@@ -0,0 +1,48 @@
+import sys
+import time
+from array import array
+from typing import List
+
+from pyminesweeper.analytics import analyze, analyze_batch
+from pyminesweeper.hints import compute_hints, load_numpy
+from pyminesweeper.placement import place_mines
+
+# Expert boards: 16 rows, 30 columns, 99 mines.
+ROWS: int = 16
+COLS: int = 30
+MINES: int = 99
+
+
+def boards(count: int) -> List[array]:
+    out: List[array] = []
+    seed: int
+    for seed in range(count):
+        values: array = array("b", bytes(ROWS * COLS))
+        i: int
+        for i in place_mines(ROWS, COLS, MINES, seed = seed):
+            values[i] = -1
+        out.append(compute_hints(values, ROWS, COLS))
+    return out
+
+
+def main(count: int):
+    grids: List[array] = boards(count)
+    print("method\tboards\tseconds\tboards/min")
+    start: float = time.perf_counter()
+    values: array
+    for values in grids[:max(1, count // 10)]:
+        analyze(values, ROWS, COLS)
+    elapsed: float = time.perf_counter() - start
+    print("python\t%d\t%.3f\t%.0f" % (max(1, count // 10), elapsed, 60 * max(1, count // 10) / elapsed))
+    numpy = load_numpy()
+    if numpy is None:
+        return
+    stack = numpy.frombuffer(b"".join(g.tobytes() for g in grids), dtype = numpy.int8).reshape(count, ROWS, COLS)
+    start = time.perf_counter()
+    analyze_batch(stack)
+    elapsed = time.perf_counter() - start
+    print("numpy\t%d\t%.3f\t%.0f" % (count, elapsed, 60 * count / elapsed))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
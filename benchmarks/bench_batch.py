@@ -0,0 +1,103 @@
+import random
+import sys
+import time
+from array import array
+from typing import List, Tuple
+
+from pyminesweeper.board import MINE, REVEALED
+from pyminesweeper.minesweepermap import OPS, MinesweeperMap
+
+# Plays the same move list one apply() at a time and in one apply_batch(),
+# as (mode, x, y) tuples and as flat codes, from the same first click.
+# "reveal" flags every mine and then reveals every safe cell in a random
+# order. "chord" flags every mine and then clears the board by chording
+# revealed numbers, the way a solver finishes a game.
+Move = Tuple[str, int, int]
+
+
+def new_game(size: int, density: float) -> MinesweeperMap:
+    game: MinesweeperMap = MinesweeperMap(size, density, size)
+    game.new_game((size // 2, size // 2))
+    return game
+
+
+def reveal_moves(size: int, density: float) -> List[Move]:
+    game: MinesweeperMap = new_game(size, density)
+    cells: List[int] = list(range(size * size))
+    random.Random(size).shuffle(cells)
+    values = game.board.values
+    return ([("f",) + divmod(i, size) for i in cells if values[i] == MINE]
+            + [("r",) + divmod(i, size) for i in cells if values[i] != MINE])
+
+
+def chord_moves(size: int, density: float) -> List[Move]:
+    # Recorded from a game played to the end, so every chord does something.
+    # With every mine flagged, each revealed number can be chorded; the cells
+    # a chord reveals are queued in turn, in a random order.
+    game: MinesweeperMap = new_game(size, density)
+    rng: random.Random = random.Random(size)
+    moves: List[Move] = []
+    values = game.board.values
+    states = game.board.states
+    i: int
+    for i in range(size * size):
+        if values[i] == MINE:
+            move: Move = ("f",) + divmod(i, size)
+            game.apply(move)
+            moves.append(move)
+    queue: List[int] = [i for i in range(size * size) if states[i] == REVEALED and values[i] > 0]
+    rng.shuffle(queue)
+    while queue and game.result == 0:
+        move = ("c",) + divmod(queue.pop(), size)
+        changed = game.apply(move).changed
+        if changed:
+            moves.append(move)
+            numbers: List[int] = [j for j in changed if values[j] > 0]
+            rng.shuffle(numbers)
+            queue.extend(numbers)
+    # Pockets walled in by mines cannot be reached by chords.
+    for i in range(size * size):
+        if game.result == 0 and values[i] != MINE and states[i] != REVEALED:
+            move = ("r",) + divmod(i, size)
+            game.apply(move)
+            moves.append(move)
+    return moves
+
+
+def main(sizes: List[int], density: float = 0.15):
+    print("size\tworkload\tmoves\tapply s\tbatch s\tcodes s\tspeedup")
+    size: int
+    for size in sizes:
+        workload: str
+        for workload, make in (("reveal", reveal_moves), ("chord", chord_moves)):
+            moves: List[Move] = make(size, density)
+            codes: array = array("q", ((x * size + y) << 2 | OPS[m] for m, x, y in moves))
+
+            single: MinesweeperMap = new_game(size, density)
+            start: float = time.perf_counter()
+            move: Move
+            for move in moves:
+                single.apply(move)
+            applied: float = time.perf_counter() - start
+
+            batched: MinesweeperMap = new_game(size, density)
+            start = time.perf_counter()
+            batched.apply_batch(moves)
+            batch: float = time.perf_counter() - start
+
+            coded: MinesweeperMap = new_game(size, density)
+            start = time.perf_counter()
+            coded.apply_batch(codes)
+            coded_time: float = time.perf_counter() - start
+
+            game: MinesweeperMap
+            for game in (batched, coded):
+                assert bytes(game.board.states) == bytes(single.board.states)
+                assert (game.turns, game.flags, game.result) == (single.turns, single.flags, single.result)
+            assert single.result == 1
+            print("%d\t%s\t%d\t%.3f\t%.3f\t%.3f\t%.2fx" % (size, workload, len(moves), applied, batch, coded_time,
+                                                            applied / coded_time))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 1000])
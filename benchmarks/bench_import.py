@@ -0,0 +1,86 @@
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Set, Tuple
+
+# Cold-start cost of the package, as a fresh worker process pays it: each
+# statement runs in a new interpreter under -X importtime, and the
+# cumulative time of the modules it imported is summed, NumPy included; its
+# share is also shown in its own column. The headless statements must not
+# load the UI, colorama or NumPy and must stay within --budget milliseconds,
+# or the script exits non-zero.
+STATEMENTS: List[Tuple[str, str, bool]] = [
+    ("package", "import pyminesweeper", True),
+    ("engine", "from pyminesweeper.minesweepermap import MinesweeperMap", True),
+    ("ui", "from pyminesweeper import MinesweeperUI", False),
+]
+HEAVY_MODULES: Tuple[str, ...] = ("colorama", "numpy", "pyminesweeper.minesweeperui")
+OPTIONAL: str = "numpy"
+MARKER: str = "--- statement ---"
+# Top-level modules that are neither the standard library nor dependencies.
+NOT_THIRD_PARTY: Set[str] = {"__main__", "pyminesweeper", "sitecustomize", "usercustomize", "_distutils_hack"}
+
+
+def import_time(statement: str) -> Tuple[float, float, Set[str]]:
+    # (ms importing, ms of that spent in NumPy, modules loaded) for one run
+    # of statement. Interpreter startup is excluded by a marker line.
+    script: str = "import sys; print(%r, file = sys.stderr); %s; print(%r + ','.join(sys.modules), file = sys.stderr)" \
+                  % (MARKER, statement, MARKER)
+    env = dict(os.environ, PYTHONPATH = os.pathsep.join(sys.path))
+    out: str = subprocess.run([sys.executable, "-X", "importtime", "-c", script], env = env, check = True,
+                              stderr = subprocess.PIPE, universal_newlines = True).stderr
+    lines: List[str] = out.split(MARKER)[1].splitlines()
+    loaded: Set[str] = set(out.split(MARKER)[2].strip().split(","))
+    total: int = 0
+    optional: int = 0
+    line: str
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Names are indented by nesting depth; a top-level import's time
+        # already includes everything it imported.
+        if not name.startswith("  "):
+            total += int(cumulative)
+        if name.strip() == OPTIONAL:
+            optional = max(optional, int(cumulative))
+    return total / 1000, optional / 1000, loaded
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog = "python -m benchmarks.bench_import")
+    parser.add_argument("--repeat", type = int, default = 7, help = "interpreters per statement, median kept")
+    parser.add_argument("--budget", type = float, default = 40.0, help = "ms allowed for each headless import")
+    args = parser.parse_args(argv)
+
+    failed: bool = False
+    print("import\tms\t%s ms\tmodules\tthird-party" % OPTIONAL)
+    label: str
+    statement: str
+    headless: bool
+    for label, statement, headless in STATEMENTS:
+        runs: List[Tuple[float, float]] = []
+        loaded: Set[str] = set()
+        _: int
+        for _ in range(args.repeat):
+            total, optional, loaded = import_time(statement)
+            runs.append((total, optional))
+        runs.sort()
+        own, optional = runs[len(runs) // 2]
+        third_party: List[str] = sorted({name.split(".")[0] for name in loaded} - set(sys.stdlib_module_names)
+                                        - NOT_THIRD_PARTY)
+        print("%s\t%.1f\t%.1f\t%d\t%s" % (label, own, optional, len(loaded), ",".join(third_party) or "-"))
+        if headless:
+            leaked: List[str] = [name for name in HEAVY_MODULES if name in loaded]
+            if leaked:
+                print("%s loads %s" % (label, ", ".join(leaked)), file = sys.stderr)
+                failed = True
+            if own > args.budget:
+                print("%s takes %.1f ms, over the %.1f ms budget" % (label, own, args.budget), file = sys.stderr)
+                failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
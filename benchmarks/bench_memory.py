@@ -0,0 +1,71 @@
+import enum
+import sys
+import time
+import tracemalloc
+from typing import List, Tuple
+
+from pyminesweeper.board import Board
+from pyminesweeper.chunked import ChunkedGame
+
+# Boards above these sizes are not built whole (a 10000x10000 legacy grid
+# alone takes tens of GB); the chunked game is measured at any size.
+MAX_LEGACY_SIZE: int = 2000
+MAX_BOARD_SIZE: int = 20000
+
+
+# The grid representation MinesweeperMap used before the flat Board.
+@enum.unique
+class LegacyState(enum.Enum):
+    HIDDEN: int = 0
+    REVEALED: int = 1
+    FLAGGED: int = 2
+
+
+class LegacyMap:
+    def __init__(self):
+        self.val: int = 0
+        self.state: LegacyState = LegacyState.HIDDEN
+
+
+def build_legacy(size: int):
+    return [[LegacyMap() for _ in range(size)] for _ in range(size)]
+
+
+def build_board(size: int):
+    return Board(size, size)
+
+
+def build_chunked(size: int):
+    # A game after its first reveal, which only generates the tiles around
+    # the opening.
+    game: ChunkedGame = ChunkedGame(size, size, 0.15, size)
+    game.apply(("r", size // 2, size // 2))
+    return game
+
+
+def measure(build, size: int) -> Tuple[int, float]:
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    grid = build(size)
+    elapsed: float = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del grid
+    return current, elapsed
+
+
+def main(sizes: List[int]):
+    print("size\tlegacy bytes\tboard bytes\tchunked bytes\tratio\tlegacy s\tboard s\tchunked s")
+    size: int
+    for size in sizes:
+        legacy_bytes, legacy_time = measure(build_legacy, size) if size <= MAX_LEGACY_SIZE else (0, 0.0)
+        board_bytes, board_time = measure(build_board, size) if size <= MAX_BOARD_SIZE else (0, 0.0)
+        chunked_bytes, chunked_time = measure(build_chunked, size)
+        print("%d\t%s\t%s\t%d\t%s\t%s\t%s\t%.4f" % (
+            size, legacy_bytes or "-", board_bytes or "-", chunked_bytes,
+            "%.1fx" % (legacy_bytes / max(1, board_bytes)) if legacy_bytes and board_bytes else "-",
+            "%.4f" % legacy_time if legacy_bytes else "-", "%.4f" % board_time if board_bytes else "-", chunked_time))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 500, 1000, 100000])
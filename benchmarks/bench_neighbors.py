@@ -0,0 +1,74 @@
+import sys
+import time
+from array import array
+from typing import List
+
+from pyminesweeper.board import MINE
+from pyminesweeper.neighbors import NeighborTable, neighbor_table
+from pyminesweeper.placement import number_of_mines, place_mines
+
+
+# The eight bounds-checked offsets nearby_bombs used before the table.
+def count_branches(values: array, rows: int, cols: int) -> int:
+    total: int = 0
+    i: int
+    j: int
+    for i in range(rows):
+        for j in range(cols):
+            k: int = i * cols + j
+            if i > 0:
+                total += values[k - cols] == MINE
+                if j > 0:
+                    total += values[k - cols - 1] == MINE
+                if j < cols - 1:
+                    total += values[k - cols + 1] == MINE
+            if i < rows - 1:
+                total += values[k + cols] == MINE
+                if j > 0:
+                    total += values[k + cols - 1] == MINE
+                if j < cols - 1:
+                    total += values[k + cols + 1] == MINE
+            if j > 0:
+                total += values[k - 1] == MINE
+            if j < cols - 1:
+                total += values[k + 1] == MINE
+    return total
+
+
+def count_table(values: array, table: NeighborTable) -> int:
+    total: int = 0
+    offsets: array = table.offsets
+    indices: array = table.indices
+    k: int
+    for k in range(len(offsets) - 1):
+        n: int
+        for n in indices[offsets[k]:offsets[k + 1]]:
+            total += values[n] == MINE
+    return total
+
+
+def main(sizes: List[int], density: float = 0.15):
+    print("size\tbuild s\tbranches s\ttable s\tspeedup")
+    size: int
+    for size in sizes:
+        values: array = array("b", bytes(size * size))
+        i: int
+        for i in place_mines(size, size, number_of_mines(size, size, density), seed = size):
+            values[i] = MINE
+        neighbor_table.cache_clear()
+        start: float = time.perf_counter()
+        table: NeighborTable = neighbor_table(size, size)
+        build: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected: int = count_branches(values, size, size)
+        branches: float = time.perf_counter() - start
+        start = time.perf_counter()
+        counted: int = count_table(values, table)
+        tabled: float = time.perf_counter() - start
+        assert counted == expected
+        print("%d\t%.4f\t%.4f\t%.4f\t%.2fx" % (size, build, branches, tabled, branches / tabled))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [50, 100, 250])
@@ -0,0 +1,39 @@
+import sys
+import time
+from typing import List
+
+from pyminesweeper.minesweepermap import MinesweeperMap, MoveResult
+from pyminesweeper.solver import Solver
+
+# Expert boards: 16x30 with 99 mines.
+ROWS: int = 16
+COLS: int = 30
+MINES: int = 99
+
+
+def main(games: int):
+    latencies: List[float] = []
+    won: int = 0
+    seed: int
+    for seed in range(games):
+        game: MinesweeperMap = MinesweeperMap(ROWS, MINES / (ROWS * COLS), seed, cols = COLS)
+        assert game.num_mines == MINES
+        solver: Solver = Solver(game)
+        result: MoveResult = game.new_game((ROWS // 2, COLS // 2))
+        while result.result == 0:
+            solver.update(result.changed)
+            move = solver.next_move()
+            if move is None:
+                start: float = time.perf_counter()
+                move = solver.guess()
+                latencies.append(time.perf_counter() - start)
+            result = game.apply(move)
+        won += result.result == 1
+    latencies.sort()
+    print("games\twon\tqueries\tmean ms\tp95 ms\tmax ms")
+    print("%d\t%d\t%d\t%.2f\t%.2f\t%.2f" % (games, won, len(latencies), 1000 * sum(latencies) / len(latencies),
+                                          1000 * latencies[int(0.95 * (len(latencies) - 1))], 1000 * latencies[-1]))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
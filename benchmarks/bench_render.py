@@ -0,0 +1,69 @@
+import random
+import sys
+import time
+from typing import List
+
+from pyminesweeper.board import FLAGGED, REVEALED
+from pyminesweeper.minesweepermap import MinesweeperMap
+
+
+def legacy_map_str(game: MinesweeperMap) -> str:
+    # get_map_str as it was before row caching: one += per cell.
+    board = game.board
+    map_str: str = ""
+    i: int
+    for i in range(board.rows):
+        j: int
+        for j in range(board.cols):
+            state: int = board.state(i, j)
+            if state == FLAGGED:
+                map_str += "[|>]\t"
+            elif state == REVEALED:
+                val: int = board.value(i, j)
+                map_str += ((" " + str(val)) if val != -1 else "[X] ") + "\t"
+            else:
+                map_str += "[ ] \t"
+        map_str += "\n"
+    return map_str
+
+
+def run(size: int, moves: int, viewport: int = None):
+    game: MinesweeperMap = MinesweeperMap(size, seed = size)
+    if viewport:
+        game.set_viewport(viewport, viewport)
+    game.generate_map(size // 2, size // 2)
+    rng: random.Random = random.Random(size)
+    legacy: float = 0.0
+    incremental: float = 0.0
+    for _ in range(moves):
+        x: int = rng.randrange(size)
+        y: int = rng.randrange(size)
+        if rng.random() < 0.8:
+            game.reveal(x, y)
+        elif not game.is_revealed(x, y):
+            game.flag(x, y)
+        if viewport:
+            game.scroll_viewport(x - viewport // 2, y - viewport // 2)
+        start: float = time.perf_counter()
+        game.get_map_str()
+        incremental += time.perf_counter() - start
+        if not viewport:
+            start = time.perf_counter()
+            legacy_map_str(game)
+            legacy += time.perf_counter() - start
+    return legacy / moves, incremental / moves
+
+
+def main(sizes: List[int], moves: int = 20):
+    print("size\tviewport\tlegacy ms/move\trenderer ms/move")
+    size: int
+    for size in sizes:
+        legacy, incremental = run(size, moves)
+        print("%d\tfull\t%.3f\t%.3f" % (size, legacy * 1000, incremental * 1000))
+        if size > 40:
+            _, incremental = run(size, moves, 40)
+            print("%d\t40x40\t-\t%.3f" % (size, incremental * 1000))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 500, 1000])
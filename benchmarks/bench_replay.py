@@ -0,0 +1,68 @@
+import io
+import random
+import sys
+import time
+from typing import List
+
+from pyminesweeper.board import MINE, REVEALED
+from pyminesweeper.minesweepermap import MinesweeperMap
+from pyminesweeper.replay import MoveLog, Replay
+
+# Records a game that flags every mine, then reveals every safe cell, in a
+# random order (on a 1000x1000 board this is about 420K moves), then times
+# decoding and replaying the log and seeking to random turns. Replaying
+# includes generating the board once; moves/s leaves that out, but still
+# counts the flood fills of the openings the moves reveal.
+
+
+def record_game(size: int, density: float) -> bytes:
+    game: MinesweeperMap = MinesweeperMap(size, density, size, True)
+    fil: io.BytesIO = io.BytesIO()
+    log: MoveLog = MoveLog(fil, game)
+    game.new_game((size // 2, size // 2))
+    cells: List[int] = list(range(size * size))
+    random.Random(size).shuffle(cells)
+    values = game.board.values
+    states = game.board.states
+    i: int
+    for i in cells:
+        if values[i] == MINE:
+            game.apply(("f",) + divmod(i, size))
+    for i in cells:
+        if values[i] != MINE and states[i] != REVEALED:
+            game.apply(("r",) + divmod(i, size))
+    log.flush()
+    return fil.getvalue()
+
+
+def main(sizes: List[int], density: float = 0.15):
+    print("size\tmoves\tlog bytes\tbytes/move\trecord s\tgenerate s\treplay s\tmoves/s\tseek ms")
+    size: int
+    for size in sizes:
+        start: float = time.perf_counter()
+        data: bytes = record_game(size, density)
+        recorded: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        MinesweeperMap(size, density, size, True).generate_map(size // 2, size // 2)
+        generated: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        replay: Replay = Replay(data)
+        game: MinesweeperMap = replay.run()
+        elapsed: float = time.perf_counter() - start
+        assert game.result == 1
+
+        rng: random.Random = random.Random(0)
+        start = time.perf_counter()
+        _: int
+        for _ in range(20):
+            replay.seek(rng.randrange(len(replay) + 1))
+        seek: float = (time.perf_counter() - start) / 20
+        print("%d\t%d\t%d\t%.2f\t%.2f\t%.3f\t%.3f\t%.0f\t%.2f" % (size, len(replay), len(data), len(data) / len(replay),
+                                                                recorded, generated, elapsed,
+                                                                len(replay) / max(elapsed - generated, 1e-9), 1000 * seek))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100, 500, 1000])
@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import List, Set
+
+from pyminesweeper.server import GameServer
+
+# Load test for the game server: opens every session first, then has all of
+# them play random reveals at once. Without --port the server runs in this
+# process on a Unix socket, so server and clients share one core.
+
+
+async def session(open_connection, seed: int, size: int, moves: int, connecting: asyncio.Semaphore,
+                  opened: List[int], gate: asyncio.Event, latencies: List[float]) -> int:
+    # Connections are opened a few hundred at a time; a burst of thousands
+    # overflows the listen backlog.
+    async with connecting:
+        reader, writer = await open_connection()
+        writer.write(b"new %d 0.15 %d\n" % (size, seed))
+        await writer.drain()
+        await reader.readline()
+    opened[0] += 1
+    await gate.wait()
+    rng: random.Random = random.Random(seed)
+    hidden: Set[int] = set(range(size * size))
+    played: int = 0
+    while played < moves and hidden:
+        i: int = rng.choice(tuple(hidden))
+        start: float = time.perf_counter()
+        writer.write(b"r %d %d\n" % (i // size + 1, i % size + 1))
+        await writer.drain()
+        fields: List[bytes] = (await reader.readline()).split()
+        latencies.append(time.perf_counter() - start)
+        played += 1
+        if fields[0] != b"m":
+            break
+        hidden.discard(i)
+        cell: bytes
+        for cell in fields[4:]:
+            hidden.discard(int(cell.partition(b":")[0]))
+        if fields[1] != b"0":
+            break
+    writer.write(b"q\n")
+    await writer.drain()
+    await reader.readline()
+    writer.close()
+    return played
+
+
+async def run(sessions: int, moves: int, size: int, host: str, port: int):
+    game_server: GameServer = None
+    if port is None:
+        path: str = os.path.join(tempfile.mkdtemp(), "minesweeper.sock")
+        game_server = GameServer()
+        await game_server.start(path = path)
+        open_connection = lambda: asyncio.open_unix_connection(path)
+    else:
+        open_connection = lambda: asyncio.open_connection(host, port)
+
+    connecting: asyncio.Semaphore = asyncio.Semaphore(256)
+    opened: List[int] = [0]
+    gate: asyncio.Event = asyncio.Event()
+    latencies: List[float] = []
+    tasks = [asyncio.ensure_future(session(open_connection, seed, size, moves, connecting, opened, gate, latencies))
+             for seed in range(sessions)]
+    while opened[0] < sessions:
+        done, _ = await asyncio.wait(tasks, timeout = 0.05, return_when = asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    concurrent: int = game_server.active if game_server is not None else opened[0]
+    start: float = time.perf_counter()
+    gate.set()
+    played: int = sum(await asyncio.gather(*tasks))
+    elapsed: float = time.perf_counter() - start
+    if game_server is not None:
+        game_server.server.close()
+
+    latencies.sort()
+    print("sessions\tconcurrent\tmoves\tmoves/s\tp50 ms\tp99 ms")
+    print("%d\t%d\t%d\t%.0f\t%.2f\t%.2f" % (sessions, concurrent, played, played / elapsed,
+                                          1000 * latencies[len(latencies) // 2],
+                                          1000 * latencies[int(0.99 * (len(latencies) - 1))]))
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(prog = "python -m benchmarks.bench_server")
+    parser.add_argument("sessions", type = int, nargs = "?", default = 2000)
+    parser.add_argument("--moves", type = int, default = 20, help = "reveals per session")
+    parser.add_argument("--size", type = int, default = 16)
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = None, help = "load an already running server")
+    args = parser.parse_args(argv)
+    # Each in-process session holds two descriptors.
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    asyncio.run(run(args.sessions, args.moves, args.size, args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import sys
+import time
+from typing import Dict, List
+
+from pyminesweeper.simulate import play_game
+from pyminesweeper.solver import solver_agent
+
+GAMES: Dict[int, int] = {9: 500, 16: 200, 30: 100, 100: 10, 500: 1}
+
+
+def main(sizes: List[int], density: float = 0.15):
+    print("size\tgames\tsolved\tmoves/s\tms/game")
+    size: int
+    for size in sizes:
+        games: int = GAMES.get(size, 5)
+        solved: int = 0
+        turns: int = 0
+        start: float = time.perf_counter()
+        seed: int
+        for seed in range(games):
+            result: Dict = play_game(size, density, seed, solver_agent)
+            solved += result["result"] == "win"
+            turns += result["turns"]
+        elapsed: float = time.perf_counter() - start
+        print("%d\t%d\t%.1f%%\t%.0f\t%.2f" % (size, games, 100.0 * solved / games, turns / elapsed,
+                                             1000 * elapsed / games))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [9, 16, 30, 100, 500])
@@ -1,2 +1,19 @@
+from importlib import import_module
+from typing import Dict, List
 from .minesweepermap import MinesweeperMap
-from .minesweeperui import MinesweeperUI
\ No newline at end of file
+
+# The terminal UI needs colorama, so it is only imported on first access;
+# headless code (workers, the server, agents) imports the engine alone.
+LAZY: Dict[str, str] = {"MinesweeperUI": ".minesweeperui"}
+
+
+def __getattr__(name: str):
+    if name not in LAZY:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+    value = getattr(import_module(LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(["MinesweeperMap"] + list(LAZY))
@@ -0,0 +1,232 @@
+import argparse
+import sys
+import time
+from typing import List
+
+
+def parse_seeds(text: str) -> range:
+    # "N" is the single seed N, "A:B" the seeds A up to but excluding B.
+    start, sep, stop = text.partition(":")
+    if not sep:
+        return range(int(start), int(start) + 1)
+    return range(int(start), int(stop))
+
+
+def simulate_command(args) -> int:
+    from . import simulate
+
+    agent = simulate.load_agent(args.agent)
+    seeds: range = parse_seeds(args.seeds)
+    fmt: str = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    fil = sys.stdout if args.output == "-" else open(args.output, "w", newline = "")
+    sink = simulate.ResultSink(fil, fmt)
+    wins: int = 0
+    games: int = 0
+    start: float = time.perf_counter()
+    try:
+        for result in simulate.simulate(args.size, args.density, seeds, agent, args.workers, args.chunksize,
+                                        args.max_moves):
+            sink.write(result)
+            games += 1
+            wins += result["result"] == "win"
+    finally:
+        if fil is not sys.stdout:
+            fil.close()
+    elapsed: float = time.perf_counter() - start
+    print("%d games, %d won, %.1f games/s" % (games, wins, games / elapsed if elapsed else 0.0), file = sys.stderr)
+    return 0
+
+
+def play_command(args) -> int:
+    if args.chunked:
+        return play_chunked(args)
+    from . import instrument
+    from .minesweeperui import MinesweeperUI
+
+    pool = None
+    if args.no_guess:
+        from .noguess import BoardPool
+
+        pool = BoardPool(args.workers)
+    ui: MinesweeperUI = MinesweeperUI(pool, args.record)
+    if args.stats or args.stats_file:
+        instrument.enable()
+    dump = None
+    if args.stats_file:
+        dump = instrument.PeriodicDump(open(args.stats_file, "a"), args.stats_interval)
+        dump.start()
+    try:
+        if args.profile:
+            instrument.profile(ui.run, args.profile, sys.stderr)
+        else:
+            ui.run()
+    finally:
+        if dump is not None:
+            dump.stop()
+            dump.fil.close()
+        if pool is not None:
+            pool.close()
+        if args.stats:
+            print(instrument.format_stats(), file = sys.stderr)
+    return 0
+
+
+def play_chunked(args) -> int:
+    from . import instrument
+    from .chunked import ChunkedGame
+
+    if args.no_guess or args.record:
+        print("--no-guess and --record are not supported with --chunked", file = sys.stderr)
+        return 2
+    game = ChunkedGame(args.chunked, args.cols or args.chunked, args.density, args.seed,
+                       reveal_limit = args.reveal_limit)
+    try:
+        if args.profile:
+            instrument.profile(game.play, args.profile, sys.stderr)
+        else:
+            game.play()
+    finally:
+        game.close()
+    return 0
+
+
+def serve_command(args) -> int:
+    import asyncio
+    from . import server
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix, args.idle_timeout, args.max_sessions,
+                                 lambda line: print(line, file = sys.stderr)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def replay_command(args) -> int:
+    from . import replay
+
+    start: float = time.perf_counter()
+    log = replay.Replay.open(args.log)
+    game = log.run() if args.turn is None else log.seek(args.turn)
+    elapsed: float = time.perf_counter() - start
+    print("%d moves, replayed to turn %d in %.3f s" % (len(log), log.turn, elapsed), file = sys.stderr)
+    print("result: %s, turns: %d, lives: %d, flags: %d, remaining: %d" % (
+        {1: "win", -1: "loss", 0: "unfinished"}[game.result], game.turns, game.lives, game.flags, game.remaining))
+    if args.board:
+        print(game.get_map_str())
+    return 0
+
+
+def generate_command(args) -> int:
+    from . import generate
+
+    options = generate.GenerateOptions(args.size, args.cols or args.size, args.density, args.seed, args.output,
+                                       args.format, args.first_click, args.no_guess)
+    boards: int = 0
+    written: int = 0
+    start: float = time.perf_counter()
+    for chunk_boards, chunk_bytes in generate.generate(options, args.count, args.workers, args.chunksize):
+        boards += chunk_boards
+        written += chunk_bytes
+    elapsed: float = time.perf_counter() - start
+    print("%d boards, %.1f MB in %.2f s, %.1f boards/s" % (boards, written / 1e6, elapsed,
+                                                          boards / elapsed if elapsed else 0.0), file = sys.stderr)
+    return 0
+
+
+def analyze_command(args) -> int:
+    from . import analytics
+
+    fil = sys.stdout if args.output == "-" else open(args.output, "w", newline = "")
+    start: float = time.perf_counter()
+    try:
+        boards: int = analytics.write_csv(analytics.analyze_directory(args.directory, args.workers, args.chunksize),
+                                          fil)
+    finally:
+        if fil is not sys.stdout:
+            fil.close()
+    elapsed: float = time.perf_counter() - start
+    print("%d boards in %.2f s, %.0f boards/s" % (boards, elapsed, boards / elapsed if elapsed else 0.0),
+          file = sys.stderr)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog = "python -m pyminesweeper")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    play = commands.add_parser("play", help = "play in the terminal")
+    play.add_argument("--profile", default = None, metavar = "FILE", help = "run the session under cProfile")
+    play.add_argument("--stats", action = "store_true", help = "print hot-path timings on exit")
+    play.add_argument("--stats-file", default = None, help = "append periodic JSON timing snapshots here")
+    play.add_argument("--stats-interval", type = float, default = 10.0, help = "seconds between snapshots")
+    play.add_argument("--no-guess", action = "store_true", help = "only deal boards solvable without guessing")
+    play.add_argument("--workers", type = int, default = None, help = "processes pre-generating no-guess boards")
+    play.add_argument("--record", default = None, metavar = "DIR", help = "log every game's moves for replay")
+    play.add_argument("--chunked", type = int, default = None, metavar = "ROWS",
+                      help = "play one huge board, generated tile by tile as it is uncovered")
+    play.add_argument("--cols", type = int, default = None, help = "columns of a --chunked board, if not square")
+    play.add_argument("--density", type = float, default = 0.15, help = "mine density of a --chunked board")
+    play.add_argument("--seed", type = int, default = None, help = "seed of a --chunked board")
+    play.add_argument("--reveal-limit", type = int, default = None,
+                      help = "cells one reveal may open on a --chunked board; the next reveal continues")
+    play.set_defaults(func = play_command)
+
+    sim = commands.add_parser("simulate", help = "play many seeded games with an agent")
+    sim.add_argument("--size", type = int, default = 9)
+    sim.add_argument("--density", type = float, default = 0.15)
+    sim.add_argument("--seeds", default = "0:1000", help = "seed or seed range START:STOP")
+    sim.add_argument("--agent", default = "pyminesweeper.simulate:random_agent", help = "module:callable")
+    sim.add_argument("--workers", type = int, default = None)
+    sim.add_argument("--chunksize", type = int, default = None)
+    sim.add_argument("--max-moves", type = int, default = None)
+    sim.add_argument("--output", default = "-", help = "result file, - for stdout")
+    sim.add_argument("--format", choices = ["jsonl", "csv"], default = None)
+    sim.set_defaults(func = simulate_command)
+
+    gen = commands.add_parser("generate", help = "write many seeded maps to a directory")
+    gen.add_argument("--size", type = int, default = 9)
+    gen.add_argument("--cols", type = int, default = None, help = "columns, if not square")
+    gen.add_argument("--density", type = float, default = 0.15)
+    gen.add_argument("--count", type = int, default = 1000)
+    gen.add_argument("--seed", type = int, default = 0)
+    gen.add_argument("--output", default = "maps", help = "directory for the map files")
+    gen.add_argument("--format", choices = ["text", "binary"], default = "text")
+    gen.add_argument("--first-click", choices = ["center", "random"], default = "center",
+                     help = "cell kept safe when placing mines")
+    gen.add_argument("--no-guess", action = "store_true", help = "only boards solvable without guessing")
+    gen.add_argument("--workers", type = int, default = None)
+    gen.add_argument("--chunksize", type = int, default = None)
+    gen.set_defaults(func = generate_command)
+
+    ana = commands.add_parser("analyze", help = "write difficulty metrics of exported maps as CSV")
+    ana.add_argument("directory")
+    ana.add_argument("--output", default = "-", help = "CSV file, - for stdout")
+    ana.add_argument("--workers", type = int, default = None)
+    ana.add_argument("--chunksize", type = int, default = 2048, help = "maps per worker task")
+    ana.set_defaults(func = analyze_command)
+
+    rep = commands.add_parser("replay", help = "rebuild a game from a move log")
+    rep.add_argument("log")
+    rep.add_argument("--turn", type = int, default = None, help = "stop after this many moves")
+    rep.add_argument("--board", action = "store_true", help = "print the board as the player saw it")
+    rep.set_defaults(func = replay_command)
+
+    srv = commands.add_parser("serve", help = "host games over a line protocol on TCP or a Unix socket")
+    srv.add_argument("--host", default = "127.0.0.1")
+    srv.add_argument("--port", type = int, default = 8765)
+    srv.add_argument("--unix", default = None, metavar = "PATH", help = "listen on a Unix socket instead")
+    srv.add_argument("--idle-timeout", type = float, default = 300.0, help = "seconds before an idle session is closed")
+    srv.add_argument("--max-sessions", type = int, default = 10000)
+    srv.set_defaults(func = serve_command)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+from .board import MINE
+from .export import BinaryMap
+from .hints import load_numpy
+from .simulate import chunk_seeds
+
+# Difficulty metrics of a generated board, from its values alone:
+#   bbbv             3BV, the fewest clicks that clear the board: one per
+#                    opening plus one per number cell not touching an opening
+#   openings         8-connected regions of zero cells
+#   largest_opening  cells in the largest of them
+#   opening_cells    zero cells in all of them
+#   isolated         number cells not touching any zero cell
+#   islands          8-connected groups of isolated number cells
+#   mine_clusters    8-connected groups of mines, and largest_cluster the
+#                    size of the largest
+METRIC_FIELDS: List[str] = ["rows", "cols", "mines", "bbbv", "openings", "largest_opening", "opening_cells",
+                            "isolated", "islands", "mine_clusters", "largest_cluster"]
+CSV_FIELDS: List[str] = ["file"] + METRIC_FIELDS
+MAP_EXTENSIONS: Tuple[str, ...] = (".txt", ".pmsb")
+# Maps the characters of a text map to signed cell bytes: "0".."8" to 0..8
+# and "X" to -1 (0xFF).
+CELL_BYTES: bytes = bytes.maketrans(b"012345678X", bytes(range(9)) + b"\xff")
+
+
+def components(mask: Sequence[bool], rows: int, cols: int) -> List[int]:
+    # Sizes of the 8-connected components of mask, by single-pass union-find:
+    # each cell is joined to its already visited W, NW, N and NE neighbors.
+    parent: List[int] = list(range(rows * cols))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int):
+        a = find(a)
+        b = find(b)
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+
+    x: int
+    for x in range(rows):
+        base: int = x * cols
+        y: int
+        for y in range(cols):
+            i: int = base + y
+            if not mask[i]:
+                continue
+            if y > 0 and mask[i - 1]:
+                union(i, i - 1)
+            if x > 0:
+                if y > 0 and mask[i - cols - 1]:
+                    union(i, i - cols - 1)
+                if mask[i - cols]:
+                    union(i, i - cols)
+                if y < cols - 1 and mask[i - cols + 1]:
+                    union(i, i - cols + 1)
+
+    sizes: Dict[int, int] = {}
+    i: int
+    for i in range(rows * cols):
+        if mask[i]:
+            root: int = find(i)
+            sizes[root] = sizes.get(root, 0) + 1
+    return list(sizes.values())
+
+
+def analyze(values: Sequence[int], rows: int, cols: int) -> Dict[str, int]:
+    zeros: List[bool] = [v == 0 for v in values]
+    mines: List[bool] = [v == MINE for v in values]
+    near_zero: List[bool] = [False] * (rows * cols)
+    i: int
+    for i in range(rows * cols):
+        if zeros[i]:
+            x, y = divmod(i, cols)
+            a: int
+            for a in range(max(0, x - 1), min(rows, x + 2)):
+                b: int
+                for b in range(max(0, y - 1), min(cols, y + 2)):
+                    near_zero[a * cols + b] = True
+    isolated: List[bool] = [v > 0 and not near for v, near in zip(values, near_zero)]
+    openings: List[int] = components(zeros, rows, cols)
+    islands: List[int] = components(isolated, rows, cols)
+    clusters: List[int] = components(mines, rows, cols)
+    num_isolated: int = sum(isolated)
+    return {"rows": rows, "cols": cols, "mines": sum(mines), "bbbv": len(openings) + num_isolated,
+            "openings": len(openings), "largest_opening": max(openings, default = 0),
+            "opening_cells": sum(openings), "isolated": num_isolated, "islands": len(islands),
+            "mine_clusters": len(clusters), "largest_cluster": max(clusters, default = 0)}
+
+
+def analyze_game(game) -> Dict[str, int]:
+    if not game.generated:
+        raise ValueError("the board has not been generated yet")
+    return analyze(game.board.values, game.board.rows, game.board.cols)
+
+
+def _neighborhood(grids, reduce, fill):
+    # reduce over each cell's 3x3 neighborhood, for a (boards, rows, cols)
+    # stack; cells past the edge count as fill.
+    numpy = load_numpy()
+    boards, rows, cols = grids.shape
+    padded = numpy.full((boards, rows + 2, cols + 2), fill, dtype = grids.dtype)
+    padded[:, 1:-1, 1:-1] = grids
+    out = grids.copy()
+    dx: int
+    for dx in range(3):
+        dy: int
+        for dy in range(3):
+            out = reduce(out, padded[:, dx:dx + rows, dy:dy + cols])
+    return out
+
+
+def _components_numpy(masks):
+    # Union-find over a whole stack of masks at once, on the masked cells
+    # only. The edges between masked cells and their W, NW, N and NE
+    # neighbors are listed up front; each round hooks the larger root of
+    # every edge whose ends disagree onto the smaller one, then pointer-jumps
+    # every label to its root. Rounds stop when no edge is left between two
+    # components. Returns the component count, largest component and cells
+    # covered per board.
+    numpy = load_numpy()
+    boards, rows, cols = masks.shape
+    flat = masks.ravel()
+    members = numpy.flatnonzero(flat)
+    count: int = len(members)
+    compact = numpy.zeros(flat.size, dtype = numpy.int32)
+    compact[members] = numpy.arange(count, dtype = numpy.int32)
+    compact = compact.reshape(masks.shape)
+    starts: List = []
+    ends: List = []
+    for (dx, dy) in ((0, -1), (-1, -1), (-1, 0), (-1, 1)):
+        here = (slice(None), slice(-dx, None), slice(max(0, -dy), cols - max(0, dy)))
+        there = (slice(None), slice(0, rows + dx), slice(max(0, dy), cols - max(0, -dy)))
+        linked = masks[here] & masks[there]
+        starts.append(compact[here][linked])
+        ends.append(compact[there][linked])
+    a = numpy.concatenate(starts)
+    b = numpy.concatenate(ends)
+    labels = numpy.arange(count, dtype = numpy.int32)
+    while len(a):
+        # Edges are carried over as edges between their ends' labels, so
+        # edges inside one component drop out and later rounds shrink.
+        la = labels[a]
+        lb = labels[b]
+        split = la != lb
+        a = numpy.maximum(la, lb)[split]
+        b = numpy.minimum(la, lb)[split]
+        if not len(a):
+            break
+        numpy.minimum.at(labels, a, b)
+        while True:
+            jumped = labels[labels]
+            if numpy.array_equal(jumped, labels):
+                break
+            labels = jumped
+    roots = numpy.flatnonzero(labels == numpy.arange(count, dtype = numpy.int32))
+    sizes = numpy.bincount(labels, minlength = count)[roots]
+    board = members[roots] // (rows * cols)
+    components = numpy.bincount(board, minlength = boards)
+    largest = numpy.zeros(boards, dtype = numpy.int64)
+    numpy.maximum.at(largest, board, sizes)
+    return components, largest, numpy.bincount(board, weights = sizes, minlength = boards).astype(numpy.int64)
+
+
+def analyze_batch(grids) -> List[Dict[str, int]]:
+    # analyze() for a (boards, rows, cols) int8 stack of same-shaped boards.
+    numpy = load_numpy()
+    if numpy is None:
+        raise ImportError("NumPy is not installed")
+    boards, rows, cols = grids.shape
+    zeros = grids == 0
+    mines = grids == MINE
+    isolated = (grids > 0) & ~_neighborhood(zeros, numpy.logical_or, False)
+    openings, largest_opening, opening_cells = _components_numpy(zeros)
+    islands, _, _ = _components_numpy(isolated)
+    clusters, largest_cluster, _ = _components_numpy(mines)
+    num_isolated = isolated.sum(axis = (1, 2))
+    num_mines = mines.sum(axis = (1, 2))
+    return [{"rows": rows, "cols": cols, "mines": int(num_mines[b]), "bbbv": int(openings[b] + num_isolated[b]),
+             "openings": int(openings[b]), "largest_opening": int(largest_opening[b]),
+             "opening_cells": int(opening_cells[b]), "isolated": int(num_isolated[b]), "islands": int(islands[b]),
+             "mine_clusters": int(clusters[b]), "largest_cluster": int(largest_cluster[b])}
+            for b in range(boards)]
+
+
+def load_map(path: str) -> Tuple[int, int, bytes]:
+    # (rows, cols, values) of an exported text or binary map; values holds
+    # one signed byte per cell, row-major.
+    if path.endswith(".pmsb"):
+        with BinaryMap(path) as binary:
+            values = bytearray()
+            row: List[int]
+            for row in binary.iter_rows():
+                values.extend(v & 0xFF for v in row)
+            return binary.rows, binary.cols, bytes(values)
+    with open(path, "rb") as fil:
+        header: bytes = fil.readline()
+        body: bytes = fil.read()
+    fields: List[int] = [int(field) for field in header.split()]
+    rows: int = fields[0]
+    cols: int = fields[1] if len(fields) == 3 else fields[0]
+    # Every cell is one character, a digit or X, so dropping the separators
+    # leaves one byte per cell.
+    cells: bytes = body.translate(None, b" \t\r\n")
+    if len(cells) != rows * cols:
+        raise ValueError(path + " does not hold a %dx%d map" % (rows, cols))
+    return rows, cols, cells.translate(CELL_BYTES)
+
+
+def analyze_files(paths: List[str]) -> List[Dict]:
+    # Metrics of each map, in order. Same-shaped boards are analyzed as one
+    # NumPy stack when NumPy is available.
+    loaded: List[Tuple[int, int, bytes]] = [load_map(path) for path in paths]
+    results: List[Optional[Dict]] = [None] * len(paths)
+    numpy = load_numpy()
+    if numpy is not None:
+        shapes: Dict[Tuple[int, int], List[int]] = {}
+        n: int
+        for n, (rows, cols, _) in enumerate(loaded):
+            shapes.setdefault((rows, cols), []).append(n)
+        for (rows, cols), members in shapes.items():
+            grids = numpy.frombuffer(b"".join(loaded[n][2] for n in members),
+                                     dtype = numpy.int8).reshape(len(members), rows, cols)
+            for n, metrics in zip(members, analyze_batch(grids)):
+                results[n] = metrics
+    else:
+        for n, (rows, cols, values) in enumerate(loaded):
+            results[n] = analyze([v - 256 if v > 127 else v for v in values], rows, cols)
+    for n, path in enumerate(paths):
+        results[n]["file"] = os.path.basename(path)
+    return results
+
+
+def map_files(directory: str) -> List[str]:
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(MAP_EXTENSIONS))
+
+
+def analyze_directory(directory: str, workers: int = None, chunksize: int = 2048) -> Iterator[Dict]:
+    # Yields the metrics of every map in directory, in filename order.
+    paths: List[str] = map_files(directory)
+    chunks: List[List[str]] = [paths[chunk.start:chunk.stop] for chunk in chunk_seeds(range(len(paths)), chunksize)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        chunk: List[str]
+        for chunk in chunks:
+            yield from analyze_files(chunk)
+        return
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        results: List[Dict]
+        for results in pool.map(analyze_files, chunks):
+            yield from results
+
+
+def write_csv(results: Iterator[Dict], fil: TextIO) -> int:
+    writer = csv.DictWriter(fil, fieldnames = CSV_FIELDS)
+    writer.writeheader()
+    count: int = 0
+    result: Dict
+    for result in results:
+        writer.writerow(result)
+        count += 1
+    return count
@@ -0,0 +1,216 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Tuple
+from .hints import load_numpy
+from .minesweepermap import MinesweeperMap
+
+# Each operation is run on a fresh seeded game, in order, so the later ones
+# see the state a real game would: mines placed, hints computed and the first
+# click revealed. export_map and stream_export generate their own map on a
+# fresh game, as the export menu does.
+OPERATIONS: List[str] = ["generate_bombs", "generate_hints", "reveal", "get_map_str", "map_revealed",
+                         "export_map", "stream_export"]
+SIZES: List[int] = [10, 100, 500, 1000, 2000]
+DENSITIES: List[float] = [0.1, 0.15, 0.2]
+RESULTS_VERSION: int = 2
+# Every case is timed at least this many times: the best run is compared,
+# and the spread of the runs tells compare how noisy the case is.
+MIN_REPEAT: int = 5
+
+
+def discard(text: str):
+    pass
+
+
+def steps(size: int, density: float, seed: int) -> Iterator[Tuple[str, Callable[[], object]]]:
+    game: MinesweeperMap = MinesweeperMap(size, density, seed, safe_neighborhood = True)
+    center: int = size // 2
+    yield "generate_bombs", lambda: game.generate_bombs(center, center)
+    yield "generate_hints", game.generate_hints
+    game.generated = True
+    yield "reveal", lambda: game.reveal(center, center)
+    yield "get_map_str", game.get_map_str
+    yield "map_revealed", game.map_revealed
+    fresh: MinesweeperMap = MinesweeperMap(size, density, seed, safe_neighborhood = True)
+    yield "export_map", lambda: fresh.export_map(discard)
+    fresh = MinesweeperMap(size, density, seed, safe_neighborhood = True)
+    yield "stream_export", lambda: fresh.stream_export(discard)
+
+
+def time_case(size: int, density: float, seed: int, operations: List[str]) -> Dict[str, float]:
+    # The garbage collector is paused while a step runs, as timeit does, so
+    # a collection triggered by earlier garbage is not charged to it.
+    times: Dict[str, float] = {}
+    for name, step in steps(size, density, seed):
+        gc.collect()
+        gc.disable()
+        try:
+            start: float = time.perf_counter()
+            step()
+            elapsed: float = time.perf_counter() - start
+        finally:
+            gc.enable()
+        if name in operations:
+            times[name] = elapsed
+    return times
+
+
+def memory_case(size: int, density: float, seed: int, operations: List[str]) -> Dict[str, int]:
+    # Peak bytes allocated while the operation ran, above what was already
+    # live when it started. tracemalloc slows everything down, so this is a
+    # separate pass from the timing one.
+    peaks: Dict[str, int] = {}
+    tracemalloc.start()
+    try:
+        for name, step in steps(size, density, seed):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = step()
+            _, peak = tracemalloc.get_traced_memory()
+            del result
+            if name in operations:
+                peaks[name] = peak - before
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def default_repeat(size: int) -> int:
+    # Small boards finish in microseconds, so take the best of more runs.
+    return 7 if size <= 100 else MIN_REPEAT
+
+
+def run(sizes: List[int], densities: List[float], seed: int = 0, repeat: int = None,
+        operations: List[str] = None, memory: bool = True, log = None) -> Dict:
+    # Cases are timed in rounds, one run of every case per round, so a slow
+    # stretch of the machine shows up in the spread of each case's runs
+    # instead of only in the cases that happened to run during it.
+    operations = operations or OPERATIONS
+    cases: List[Tuple[int, float]] = [(size, density) for size in sizes for density in densities]
+    repeats: Dict[Tuple[int, float], int] = {case: max(MIN_REPEAT, repeat or default_repeat(case[0]))
+                                             for case in cases}
+    samples: Dict[Tuple[int, float], Dict[str, List[float]]] = {case: {name: [] for name in operations}
+                                                                for case in cases}
+    n: int
+    for n in range(max(repeats.values(), default = 0)):
+        case: Tuple[int, float]
+        for case in cases:
+            if n < repeats[case]:
+                name: str
+                seconds: float
+                for name, seconds in time_case(case[0], case[1], seed, operations).items():
+                    samples[case][name].append(seconds)
+
+    results: List[Dict] = []
+    for case in cases:
+        size, density = case
+        peaks: Dict[str, int] = memory_case(size, density, seed, operations) if memory else {}
+        for name in operations:
+            times: List[float] = samples[case][name]
+            results.append({"op": name, "size": size, "density": density, "seed": seed,
+                            "repeat": repeats[case], "seconds": min(times), "spread": max(times) - min(times),
+                            "peak_bytes": peaks.get(name)})
+            if log is not None:
+                log("%-14s %5d %.2f %10.4f s %12s B" % (name, size, density, min(times), peaks.get(name, "-")))
+    return {"version": RESULTS_VERSION, "python": platform.python_version(), "numpy": load_numpy() is not None,
+            "time": time.time(), "results": results}
+
+
+def load_results(path: str) -> Dict[Tuple[str, int, float], Dict]:
+    with open(path) as fil:
+        data: Dict = json.load(fil)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError("unsupported benchmark results version in " + path)
+    return {(entry["op"], entry["size"], entry["density"]): entry for entry in data["results"]}
+
+
+def compare(old: Dict[Tuple[str, int, float], Dict], new: Dict[Tuple[str, int, float], Dict],
+            threshold: float = 0.1, min_seconds: float = 0.001, noise_factor: float = 1.0) -> List[Dict]:
+    # A case regresses when it got more than threshold slower (or hungrier)
+    # and the slowdown is above both min_seconds and noise_factor times the
+    # larger spread of its runs in the two files; anything less is noise.
+    rows: List[Dict] = []
+    key: Tuple[str, int, float]
+    for key in sorted(old.keys() & new.keys()):
+        before: Dict = old[key]
+        after: Dict = new[key]
+        ratio: float = after["seconds"] / before["seconds"] if before["seconds"] else 1.0
+        margin: float = max(min_seconds, noise_factor * max(before["spread"], after["spread"]))
+        slower: bool = ratio > 1 + threshold and after["seconds"] - before["seconds"] > margin
+        memory_ratio: float = 1.0
+        if before["peak_bytes"] and after["peak_bytes"] is not None:
+            memory_ratio = after["peak_bytes"] / before["peak_bytes"]
+        hungrier: bool = memory_ratio > 1 + threshold and after["peak_bytes"] - before["peak_bytes"] > 4096
+        rows.append({"op": key[0], "size": key[1], "density": key[2], "old_seconds": before["seconds"],
+                     "new_seconds": after["seconds"], "ratio": ratio, "memory_ratio": memory_ratio,
+                     "regression": slower or hungrier})
+    return rows
+
+
+def run_command(args) -> int:
+    data: Dict = run(args.sizes, args.densities, args.seed, args.repeat, args.ops, not args.no_memory,
+                     lambda line: print(line, file = sys.stderr))
+    if args.output == "-":
+        json.dump(data, sys.stdout, indent = 1)
+        print()
+    else:
+        with open(args.output, "w") as fil:
+            json.dump(data, fil, indent = 1)
+    return 0
+
+
+def compare_command(args) -> int:
+    rows: List[Dict] = compare(load_results(args.old), load_results(args.new), args.threshold, args.min_seconds,
+                               args.noise_factor)
+    print("op\tsize\tdensity\told s\tnew s\ttime\tmemory")
+    regressions: int = 0
+    row: Dict
+    for row in rows:
+        regressions += row["regression"]
+        print("%s\t%d\t%.2f\t%.4f\t%.4f\t%.2fx\t%.2fx%s" % (row["op"], row["size"], row["density"],
+                                                            row["old_seconds"], row["new_seconds"], row["ratio"],
+                                                            row["memory_ratio"],
+                                                            "\tREGRESSION" if row["regression"] else ""))
+    print("%d of %d cases regressed" % (regressions, len(rows)), file = sys.stderr)
+    return 1 if regressions else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog = "python -m pyminesweeper.bench")
+    commands = parser.add_subparsers(dest = "command", required = True)
+
+    bench = commands.add_parser("run", help = "time and measure the board operations")
+    bench.add_argument("--sizes", type = int, nargs = "+", default = SIZES)
+    bench.add_argument("--densities", type = float, nargs = "+", default = DENSITIES)
+    bench.add_argument("--ops", nargs = "+", choices = OPERATIONS, default = None)
+    bench.add_argument("--seed", type = int, default = 0)
+    bench.add_argument("--repeat", type = int, default = None,
+                       help = "timing runs per case, at least %d; the best is kept" % MIN_REPEAT)
+    bench.add_argument("--no-memory", action = "store_true", help = "skip the tracemalloc pass")
+    bench.add_argument("--output", default = "-", help = "results file, - for stdout")
+    bench.set_defaults(func = run_command)
+
+    cmp = commands.add_parser("compare", help = "flag regressions between two results files")
+    cmp.add_argument("old")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type = float, default = 0.1, help = "allowed slowdown, 0.1 is 10%%")
+    cmp.add_argument("--min-seconds", type = float, default = 0.001)
+    cmp.add_argument("--noise-factor", type = float, default = 1.0,
+                     help = "a slowdown must exceed this many times the spread of the runs")
+    cmp.set_defaults(func = compare_command)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+from array import array
+import enum
+from typing import Tuple
+
+
+@enum.unique
+class State(enum.Enum):
+    HIDDEN: int = 0
+    REVEALED: int = 1
+    FLAGGED: int = 2
+
+
+HIDDEN: int = State.HIDDEN.value
+REVEALED: int = State.REVEALED.value
+FLAGGED: int = State.FLAGGED.value
+MINE: int = -1
+
+# Cell strings indexed by value; a mine (-1) picks the last entry.
+REVEALED_CELLS: Tuple[str, ...] = tuple(str(v) + " " for v in range(9)) + ("X ",)
+PLAY_REVEALED_CELLS: Tuple[str, ...] = tuple(" " + str(v) + "\t" for v in range(9)) + ("[X] \t",)
+PLAY_HIDDEN_CELL: str = "[ ] \t"
+PLAY_FLAGGED_CELL: str = "[|>]\t"
+# Arrays of flat cell indices use 4-byte "i" items unless a board has more
+# cells than an "i" can address.
+INDEX_LIMIT: int = 1 << (8 * array("i").itemsize - 1)
+
+
+class Board:
+    # Values and states live in two flat buffers addressed by x * cols + y:
+    # one signed byte per value (-1 is a mine) and one byte per State.
+    def __init__(self, rows: int, cols: int, values = None, states = None):
+        self.rows: int = rows
+        self.cols: int = cols
+        self.values = array("b", bytes(rows * cols)) if values is None else values
+        self.states = bytearray(rows * cols) if states is None else states
+
+    def __len__(self) -> int:
+        return self.rows * self.cols
+
+    def index(self, x: int, y: int) -> int:
+        return x * self.cols + y
+
+    def position(self, i: int) -> Tuple[int, int]:
+        return divmod(i, self.cols)
+
+    def index_array(self, cells = ()) -> array:
+        return array("i" if len(self) <= INDEX_LIMIT else "q", cells)
+
+    def value(self, x: int, y: int) -> int:
+        return self.values[x * self.cols + y]
+
+    def state(self, x: int, y: int) -> int:
+        return self.states[x * self.cols + y]
+
+    def is_mine(self, x: int, y: int) -> bool:
+        return self.values[x * self.cols + y] == MINE
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        return self.states[x * self.cols + y] == FLAGGED
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        return self.states[x * self.cols + y] == REVEALED
+
+    def is_hidden(self, x: int, y: int) -> bool:
+        return self.states[x * self.cols + y] == HIDDEN
+
+    def play_row_str(self, x: int, start: int = 0, stop: int = None) -> str:
+        base: int = x * self.cols
+        stop = self.cols if stop is None else stop
+        values = self.values
+        states = self.states
+        cells = []
+        i: int
+        for i in range(base + start, base + stop):
+            state: int = states[i]
+            if state == REVEALED:
+                cells.append(PLAY_REVEALED_CELLS[values[i]])
+            elif state == FLAGGED:
+                cells.append(PLAY_FLAGGED_CELL)
+            else:
+                cells.append(PLAY_HIDDEN_CELL)
+        cells.append("\n")
+        return "".join(cells)
+
+    def revealed_row_str(self, x: int) -> str:
+        base: int = x * self.cols
+        return "".join([REVEALED_CELLS[v] for v in self.values[base:base + self.cols]]) + "\n"
@@ -0,0 +1,470 @@
+import os
+import random
+import shutil
+import tempfile
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+from .board import HIDDEN, REVEALED, FLAGGED, MINE, PLAY_FLAGGED_CELL, PLAY_HIDDEN_CELL, PLAY_REVEALED_CELLS
+from .hints import compute_hints
+from .minesweepermap import MinesweeperMap, MoveResult
+from .placement import new_seed, number_of_mines, place_mines
+
+# Window of a ChunkedGame shown in the terminal.
+VIEWPORT_SIZE: int = 40
+
+
+class Tile:
+    __slots__ = ("values", "states")
+
+    def __init__(self, values: array, states: bytearray):
+        self.values: array = values
+        self.states: bytearray = states
+
+    def is_untouched(self) -> bool:
+        return not any(self.states)
+
+
+class ChunkedBoard:
+    # A board split into tile_size x tile_size tiles, unbounded unless rows
+    # and cols are given; cells past those bounds hold no mines and are never
+    # revealed.
+    #
+    # A tile's mines depend only on (seed, tile_x, tile_y) (and on the first
+    # click, whose 3x3 neighborhood is always clear), so tiles are generated
+    # the first time a reveal, flag or hint lookup touches them. A touched
+    # tile keeps its values, with hints computed across tile borders from the
+    # neighboring tiles' mines, and its states. At most max_tiles tiles are
+    # kept in memory; the least recently used ones are dropped, and their
+    # states are written to spill_dir if anything on them was revealed or
+    # flagged. Mine masks of merely neighboring tiles are cached separately
+    # and regenerated when needed.
+    def __init__(self, seed: int, density: float = 0.15, tile_size: int = 64, first_click: Tuple[int, int] = (0, 0),
+                 max_tiles: int = 1024, spill_dir: str = None, rows: int = None, cols: int = None):
+        self.seed: int = seed
+        self.rows: Optional[int] = rows
+        self.cols: Optional[int] = cols
+        self.density: float = density
+        self.tile_size: int = tile_size
+        self.first_click: Tuple[int, int] = first_click
+        self.mines_per_tile: int = number_of_mines(tile_size, tile_size, density)
+        self.max_tiles: int = max_tiles
+        self.tiles: "OrderedDict[Tuple[int, int], Tile]" = OrderedDict()
+        self.masks: "OrderedDict[Tuple[int, int], bytearray]" = OrderedDict()
+        self.spill_dir: Optional[str] = spill_dir
+        self.own_spill_dir: bool = False
+        self.spilled: Set[Tuple[int, int]] = set()
+        self.flags: int = 0
+        self.revealed: int = 0
+        self.mines_revealed: int = 0
+        # Revealed 0 cells whose neighbors a reveal cut short by its limit
+        # has not revealed yet.
+        self.pending: List[Tuple[int, int]] = []
+
+    def close(self):
+        if self.own_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors = True)
+        self.tiles.clear()
+        self.masks.clear()
+        self.spilled.clear()
+
+    def tile_of(self, x: int, y: int) -> Tuple[int, int, int]:
+        t: int = self.tile_size
+        return x // t, y // t, (x % t) * t + (y % t)
+
+    def contains(self, x: int, y: int) -> bool:
+        return self.rows is None or (0 <= x < self.rows and 0 <= y < self.cols)
+
+    def tile_extent(self, tx: int, ty: int) -> Tuple[int, int]:
+        # Rows and columns of the tile that lie on the board.
+        t: int = self.tile_size
+        if self.rows is None:
+            return t, t
+        if tx < 0 or ty < 0:
+            return 0, 0
+        return max(0, min(t, self.rows - tx * t)), max(0, min(t, self.cols - ty * t))
+
+    def clear_cells(self, tx: int, ty: int) -> List[int]:
+        # Cells of the tile, in tile order, kept free of mines: the first
+        # click's 3x3 neighborhood and anything past the board's bounds.
+        t: int = self.tile_size
+        fx, fy = self.first_click
+        excluded: Set[int] = {(x - tx * t) * t + (y - ty * t)
+                              for x in range(fx - 1, fx + 2) for y in range(fy - 1, fy + 2)
+                              if x // t == tx and y // t == ty}
+        h, w = self.tile_extent(tx, ty)
+        if h < t or w < t:
+            excluded.update(r * t + c for r in range(t) for c in range(t) if r >= h or c >= w)
+        return sorted(excluded)
+
+    def tile_mines(self, tx: int, ty: int, excluded: int) -> int:
+        h, w = self.tile_extent(tx, ty)
+        if h == self.tile_size and w == self.tile_size:
+            count: int = self.mines_per_tile
+        elif h == 0 or w == 0:
+            return 0
+        else:
+            count = number_of_mines(h, w, self.density)
+        return min(count, self.tile_size * self.tile_size - excluded)
+
+    def number_of_mines(self) -> int:
+        # Mines on a bounded board, from the per-tile counts without
+        # generating any tile: tiles of one shape hold the same number, except
+        # those that the first click's neighborhood clears cells on.
+        t: int = self.tile_size
+        tiles_x: int = -(-self.rows // t)
+        tiles_y: int = -(-self.cols // t)
+        full_x: int = self.rows // t
+        full_y: int = self.cols // t
+        total: int = 0
+        tx: int
+        for tx in {0, tiles_x - 1} if full_x < tiles_x else {0}:
+            ty: int
+            for ty in {0, tiles_y - 1} if full_y < tiles_y else {0}:
+                count_x: int = full_x if tx < full_x else 1
+                count_y: int = full_y if ty < full_y else 1
+                h, w = self.tile_extent(tx, ty)
+                total += count_x * count_y * self.tile_mines(tx, ty, t * t - h * w)
+        fx, fy = self.first_click
+        for tx, ty in {(x // t, y // t) for x in range(fx - 1, fx + 2) for y in range(fy - 1, fy + 2)}:
+            h, w = self.tile_extent(tx, ty)
+            total += self.tile_mines(tx, ty, len(self.clear_cells(tx, ty))) - self.tile_mines(tx, ty, t * t - h * w)
+        return total
+
+    def mine_mask(self, tx: int, ty: int) -> bytearray:
+        key: Tuple[int, int] = (tx, ty)
+        mask: Optional[bytearray] = self.masks.get(key)
+        if mask is not None:
+            self.masks.move_to_end(key)
+            return mask
+        t: int = self.tile_size
+        excluded: List[int] = self.clear_cells(tx, ty)
+        mask = bytearray(t * t)
+        rng: random.Random = random.Random("%d:%d:%d" % (self.seed, tx, ty))
+        i: int
+        for i in place_mines(t, t, self.tile_mines(tx, ty, len(excluded)), excluded, rng):
+            mask[i] = 1
+        self.masks[key] = mask
+        if len(self.masks) > 9 * self.max_tiles:
+            self.masks.popitem(last = False)
+        return mask
+
+    def tile(self, tx: int, ty: int) -> Tile:
+        key: Tuple[int, int] = (tx, ty)
+        tile: Optional[Tile] = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+            return tile
+        tile = Tile(self.tile_values(tx, ty), self.load_states(key))
+        self.tiles[key] = tile
+        if len(self.tiles) > self.max_tiles:
+            self.evict()
+        return tile
+
+    def tile_values(self, tx: int, ty: int) -> array:
+        # Hints for a tile from a (t + 2) x (t + 2) window over it and the
+        # bordering rows and columns of its eight neighbors.
+        t: int = self.tile_size
+        w: int = t + 2
+        window = array("b", bytes(w * w))
+        dx: int
+        for dx in (-1, 0, 1):
+            dy: int
+            for dy in (-1, 0, 1):
+                mask: bytearray = self.mine_mask(tx + dx, ty + dy)
+                rows = range(t) if dx == 0 else ([t - 1] if dx < 0 else [0])
+                cols = range(t) if dy == 0 else ([t - 1] if dy < 0 else [0])
+                r: int
+                for r in rows:
+                    wr: int = r + 1 + dx * t
+                    c: int
+                    for c in cols:
+                        if mask[r * t + c]:
+                            window[wr * w + c + 1 + dy * t] = MINE
+        compute_hints(window, w, w)
+        values = array("b")
+        for r in range(1, t + 1):
+            values.extend(window[r * w + 1:r * w + 1 + t])
+        return values
+
+    def load_states(self, key: Tuple[int, int]) -> bytearray:
+        if key in self.spilled:
+            self.spilled.discard(key)
+            with open(self.spill_path(key), "rb") as fil:
+                return bytearray(fil.read())
+        return bytearray(self.tile_size * self.tile_size)
+
+    def spill_path(self, key: Tuple[int, int]) -> str:
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix = "pyminesweeper-")
+            self.own_spill_dir = True
+        return os.path.join(self.spill_dir, "%d_%d.tile" % key)
+
+    def evict(self):
+        key, tile = self.tiles.popitem(last = False)
+        if not tile.is_untouched():
+            with open(self.spill_path(key), "wb") as fil:
+                fil.write(tile.states)
+            self.spilled.add(key)
+
+    def value(self, x: int, y: int) -> int:
+        tx, ty, i = self.tile_of(x, y)
+        return self.tile(tx, ty).values[i]
+
+    def state(self, x: int, y: int) -> int:
+        tx, ty, i = self.tile_of(x, y)
+        if (tx, ty) not in self.tiles and (tx, ty) not in self.spilled:
+            return HIDDEN
+        return self.tile(tx, ty).states[i]
+
+    def is_mine(self, x: int, y: int) -> bool:
+        tx, ty, i = self.tile_of(x, y)
+        return self.mine_mask(tx, ty)[i] == 1
+
+    def is_revealed(self, x: int, y: int) -> bool:
+        return self.state(x, y) == REVEALED
+
+    def is_flagged(self, x: int, y: int) -> bool:
+        return self.state(x, y) == FLAGGED
+
+    def flag(self, x: int, y: int) -> bool:
+        tx, ty, i = self.tile_of(x, y)
+        states: bytearray = self.tile(tx, ty).states
+        if states[i] == REVEALED:
+            return False
+        if states[i] == FLAGGED:
+            states[i] = HIDDEN
+            self.flags -= 1
+        else:
+            states[i] = FLAGGED
+            self.flags += 1
+        return True
+
+    def reveal(self, x: int, y: int, limit: int = None) -> Tuple[int, int, List[Tuple[int, int]]]:
+        # Flood-fills across tiles with an explicit stack of revealed 0 cells.
+        # On sparse boards an opening can be arbitrarily large, so limit caps
+        # the cells revealed by one call. The stack is kept in self.pending,
+        # and the next reveal, on any cell, or expand() carries on from it.
+        tx, ty, i = self.tile_of(x, y)
+        tile: Tile = self.tile(tx, ty)
+        val: int = tile.values[i]
+        changed: List[Tuple[int, int]] = []
+        if tile.states[i] != REVEALED:
+            self.reveal_cell(tile, i, x, y, changed)
+            if val == MINE:
+                self.mines_revealed += 1
+                return val, 1, changed
+            if val == 0:
+                self.pending.append((x, y))
+        self.flood(changed, limit)
+        return val, len(changed), changed
+
+    def expand(self, limit: int = None) -> List[Tuple[int, int]]:
+        # Continues openings left pending by a limited reveal.
+        changed: List[Tuple[int, int]] = []
+        self.flood(changed, limit)
+        return changed
+
+    def flood(self, changed: List[Tuple[int, int]], limit: Optional[int]):
+        stack: List[Tuple[int, int]] = self.pending
+        while stack:
+            cx, cy = stack.pop()
+            nx: int
+            for nx in (cx - 1, cx, cx + 1):
+                ny: int
+                for ny in (cy - 1, cy, cy + 1):
+                    if not self.contains(nx, ny):
+                        continue
+                    tx, ty, i = self.tile_of(nx, ny)
+                    tile: Tile = self.tile(tx, ty)
+                    if tile.states[i] != REVEALED:
+                        if limit is not None and len(changed) >= limit:
+                            # Its other neighbors are looked at again later.
+                            stack.append((cx, cy))
+                            return
+                        self.reveal_cell(tile, i, nx, ny, changed)
+                        if tile.values[i] == 0:
+                            stack.append((nx, ny))
+
+    def reveal_cell(self, tile: Tile, i: int, x: int, y: int, changed: List[Tuple[int, int]]):
+        if tile.states[i] == FLAGGED:
+            self.flags -= 1
+        tile.states[i] = REVEALED
+        self.revealed += 1
+        changed.append((x, y))
+
+    def get_map_str(self, top: int, left: int, rows: int, cols: int) -> str:
+        # Play string for a window of the board; only tiles that have been
+        # revealed or flagged on are looked at.
+        lines: List[str] = []
+        x: int
+        for x in range(top, top + rows):
+            cells: List[str] = []
+            y: int
+            for y in range(left, left + cols):
+                state: int = self.state(x, y)
+                if state == REVEALED:
+                    cells.append(PLAY_REVEALED_CELLS[self.value(x, y)])
+                elif state == FLAGGED:
+                    cells.append(PLAY_FLAGGED_CELL)
+                else:
+                    cells.append(PLAY_HIDDEN_CELL)
+            cells.append("\n")
+            lines.append("".join(cells))
+        return "".join(lines)
+
+    def stats(self) -> Dict[str, int]:
+        return {"tiles": len(self.tiles), "masks": len(self.masks), "spilled": len(self.spilled),
+                "pending": len(self.pending)}
+
+
+class ChunkedGame:
+    # A rows x cols game on a bounded ChunkedBoard, for boards too large for
+    # the flat Board: only tiles that have been played on are in memory.
+    # Moves and the terminal loop are those of MinesweeperMap; the tiles are
+    # seeded on the first reveal, so flags placed before it are kept aside
+    # until then. A reveal cut short by reveal_limit is continued by the
+    # next one, and the game is only won once no opening is pending.
+    validate_input = MinesweeperMap.validate_input
+    validate_mode = MinesweeperMap.validate_mode
+    validate_move = MinesweeperMap.validate_move
+    accept_input = MinesweeperMap.accept_input
+    play = MinesweeperMap.play
+
+    def __init__(self, rows: int, cols: int, density: float = 0.15, seed: int = None, tile_size: int = 64,
+                 max_tiles: int = 1024, spill_dir: str = None, reveal_limit: int = None):
+        self.rows: int = rows
+        self.cols: int = cols
+        self.density: float = density
+        self.seed: int = new_seed() if seed is None else seed
+        self.tile_size: int = tile_size
+        self.max_tiles: int = max_tiles
+        self.spill_dir: Optional[str] = spill_dir
+        self.reveal_limit: Optional[int] = reveal_limit
+        self.board: Optional[ChunkedBoard] = None
+        self.early_flags: Set[Tuple[int, int]] = set()
+        self.generated: bool = False
+        self.result: int = 0
+        self.turns: int = 0
+        self.lives: int = 3
+        self.top: int = 0
+        self.left: int = 0
+        # Until the first click clears its neighborhood, the nominal count.
+        self.num_mines: int = number_of_mines(rows, cols, density)
+
+    @property
+    def flags(self) -> int:
+        return len(self.early_flags) if self.board is None else self.board.flags
+
+    @property
+    def remaining(self) -> int:
+        revealed: int = 0 if self.board is None else self.board.revealed - self.board.mines_revealed
+        return self.rows * self.cols - self.num_mines - revealed
+
+    def close(self):
+        if self.board is not None:
+            self.board.close()
+
+    def generate_map(self, x: int, y: int):
+        self.board = ChunkedBoard(self.seed, self.density, self.tile_size, (x, y), self.max_tiles, self.spill_dir,
+                                  self.rows, self.cols)
+        self.num_mines = self.board.number_of_mines()
+        fx: int
+        fy: int
+        for fx, fy in self.early_flags:
+            self.board.flag(fx, fy)
+        self.early_flags.clear()
+        self.generated = True
+
+    def neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        return [(a, b) for a in range(max(0, x - 1), min(self.rows, x + 2))
+                for b in range(max(0, y - 1), min(self.cols, y + 2)) if a != x or b != y]
+
+    def reveal_cells(self, cells: List[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], bool]:
+        # Reveals cells in order, with their openings; returns the changed
+        # cells and whether a life was lost.
+        board: ChunkedBoard = self.board
+        changed: List[Tuple[int, int]] = []
+        life_lost: bool = False
+        x: int
+        y: int
+        for x, y in cells:
+            val, _, cells_changed = board.reveal(x, y, self.reveal_limit)
+            changed.extend(cells_changed)
+            if val == MINE and cells_changed:
+                if self.lives > 0:
+                    self.lives -= 1
+                    life_lost = True
+                else:
+                    self.result = -1
+                    break
+        return changed, life_lost
+
+    def chord_cells(self, x: int, y: int) -> List[Tuple[int, int]]:
+        # As reveal.chord_cells, with safe cells ahead of (wrongly flagged)
+        # mines.
+        board: ChunkedBoard = self.board
+        value: int = board.value(x, y)
+        if not board.is_revealed(x, y) or value <= 0:
+            return []
+        around: List[Tuple[int, int]] = self.neighbors(x, y)
+        if sum(1 for a, b in around if board.is_flagged(a, b)) != value:
+            return []
+        hidden: List[Tuple[int, int]] = [(a, b) for a, b in around if board.state(a, b) == HIDDEN]
+        return sorted(hidden, key = lambda cell: board.is_mine(*cell))
+
+    def apply(self, move) -> MoveResult:
+        # As MinesweeperMap.apply; changed holds (x, y) cells.
+        if isinstance(move, str):
+            err: bool
+            err, m, x, y = self.validate_move(move)
+            if err:
+                raise ValueError("invalid move: " + move)
+        else:
+            m, x, y = move
+            if m != "q" and not self.validate_input(x + 1, y + 1):
+                raise ValueError("move outside the board: " + str(move))
+        if self.result != 0:
+            raise ValueError("the game is over")
+
+        changed: List[Tuple[int, int]] = []
+        life_lost: bool = False
+        if m == "r" or m == "c":
+            if m == "r" and not self.generated:
+                self.generate_map(x, y)
+            if self.generated:
+                changed, life_lost = self.reveal_cells([(x, y)] if m == "r" else self.chord_cells(x, y))
+                if self.result == 0 and self.remaining == 0 and not self.board.pending:
+                    self.result = 1
+                self.turns += 1
+        elif m == "f":
+            if self.board is None:
+                self.early_flags ^= {(x, y)}
+                changed = [(x, y)]
+            else:
+                if self.board.flag(x, y):
+                    changed = [(x, y)]
+                self.turns += 1
+        elif m == "v":
+            self.top = x
+            self.left = y
+        elif m != "q":
+            raise ValueError("invalid move mode: " + str(m))
+        return MoveResult(changed, life_lost, self.result)
+
+    def get_stats_str(self) -> str:
+        return ("Lives remaining: %d\tTurns taken: %d\tFlagged places: %d\tNumber of Mines: %d\n"
+                "Rows %d-%d of %d, columns %d-%d of %d\n\n"
+                % (self.lives, self.turns, self.flags, self.num_mines,
+                   self.top + 1, min(self.rows, self.top + VIEWPORT_SIZE), self.rows,
+                   self.left + 1, min(self.cols, self.left + VIEWPORT_SIZE), self.cols))
+
+    def get_map_str(self) -> str:
+        rows: int = min(VIEWPORT_SIZE, self.rows - self.top)
+        cols: int = min(VIEWPORT_SIZE, self.cols - self.left)
+        if self.board is None:
+            return (PLAY_HIDDEN_CELL * cols + "\n") * rows
+        return self.board.get_map_str(self.top, self.left, rows, cols)
+
+    def get_play_str(self) -> str:
+        return self.get_stats_str() + self.get_map_str()
@@ -0,0 +1,101 @@
+import mmap
+import struct
+from typing import BinaryIO, Callable, Iterator, List, TextIO, Tuple
+from .board import MINE
+from .hints import hint_row
+
+# Binary maps: a fixed header followed by one bit-packed row of the mine
+# mask per board row, each row padded to whole bytes, most significant bit
+# first.
+BINARY_MAGIC: bytes = b"PMSB"
+BINARY_VERSION: int = 1
+BINARY_HEADER = struct.Struct("<4sHIIIq")
+
+
+def iter_text_export(game) -> Iterator[str]:
+    yield game.export_header()
+    yield from game.iter_map_revealed()
+
+
+def write_text(game, write: Callable[[str], object]):
+    line: str
+    for line in iter_text_export(game):
+        write(line)
+
+
+def read_text_header(fil: TextIO) -> Tuple[int, int, int]:
+    # Returns (rows, cols, mines); square maps only store one size.
+    fields: List[int] = [int(field) for field in fil.readline().split()]
+    if len(fields) == 2:
+        return fields[0], fields[0], fields[1]
+    rows, cols, num_mines = fields
+    return rows, cols, num_mines
+
+
+def iter_text_rows(fil: TextIO) -> Iterator[List[int]]:
+    # Rows of an exported text map, read after read_text_header.
+    line: str
+    for line in fil:
+        if line.strip():
+            yield [MINE if cell == "X" else int(cell) for cell in line.split()]
+
+
+def pack_row(values) -> bytes:
+    bits: str = "".join(["1" if v == MINE else "0" for v in values])
+    row_bytes: int = (len(bits) + 7) // 8
+    return int(bits.ljust(row_bytes * 8, "0") or "0", 2).to_bytes(row_bytes, "big")
+
+
+def unpack_row(data: bytes, cols: int) -> List[int]:
+    bits: str = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
+    return [1 if bit == "1" else 0 for bit in bits[:cols]]
+
+
+def write_binary(game, fil: BinaryIO):
+    board = game.board
+    fil.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, board.rows, board.cols, game.num_mines, game.seed))
+    x: int
+    for x in range(board.rows):
+        base: int = x * board.cols
+        fil.write(pack_row(board.values[base:base + board.cols]))
+
+
+class BinaryMap:
+    # Memory-mapped view of a binary map; rows are decoded on demand.
+    def __init__(self, path: str):
+        with open(path, "rb") as fil:
+            self.data = mmap.mmap(fil.fileno(), 0, access = mmap.ACCESS_READ)
+        magic, version, self.rows, self.cols, self.num_mines, self.seed = BINARY_HEADER.unpack_from(self.data)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            self.data.close()
+            raise ValueError(path + " is not a binary minesweeper map")
+        self.row_bytes: int = (self.cols + 7) // 8
+
+    def close(self):
+        self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def mine_row(self, x: int) -> List[int]:
+        start: int = BINARY_HEADER.size + x * self.row_bytes
+        return unpack_row(self.data[start:start + self.row_bytes], self.cols)
+
+    def is_mine(self, x: int, y: int) -> bool:
+        byte: int = self.data[BINARY_HEADER.size + x * self.row_bytes + y // 8]
+        return bool(byte & (0x80 >> (y % 8)))
+
+    def iter_rows(self) -> Iterator[List[int]]:
+        # Values of each row, hints included, from a sliding window of three
+        # mine masks.
+        zeros: List[int] = [0] * self.cols
+        above: List[int] = zeros
+        current: List[int] = self.mine_row(0) if self.rows else zeros
+        x: int
+        for x in range(self.rows):
+            below: List[int] = self.mine_row(x + 1) if x + 1 < self.rows else zeros
+            yield hint_row(above, current, below)
+            above, current = current, below
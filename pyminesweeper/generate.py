@@ -0,0 +1,102 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Tuple
+from . import export
+from .minesweepermap import MinesweeperMap
+from .simulate import chunk_seeds
+
+# Bulk map generation. Board i of a run with seed s gets its own seed derived
+# from (s, i). Its filename holds everything else the board depends on as
+# well (shape, density, no-guess and the first click), so a run is
+# reproducible and runs with different settings never share a filename.
+# Workers write their boards themselves and only report counts back.
+FORMATS: Tuple[str, ...] = ("text", "binary")
+EXTENSIONS = {"text": ".txt", "binary": ".pmsb"}
+WRITE_BUFFER_SIZE: int = 1 << 16
+
+
+class GenerateOptions(NamedTuple):
+    rows: int
+    cols: int
+    density: float
+    seed: int
+    output: str
+    fmt: str = "text"
+    first_click: str = "center"
+    no_guess: bool = False
+
+
+def board_seed(seed: int, index: int) -> int:
+    return random.Random("%d:%d" % (seed, index)).getrandbits(63)
+
+
+def click_seed(seed: int, index: int) -> int:
+    # Seeds the random first click apart from the mine placement, so the
+    # click is not drawn from the stream that placed the mines.
+    return random.Random("%d:%d:click" % (seed, index)).getrandbits(63)
+
+
+def map_name(options: GenerateOptions, index: int) -> str:
+    # e.g. map-16x30-0.2-noguess-random-7-000042.txt
+    flags: str = ("-noguess" if options.no_guess else "") + ("-random" if options.first_click == "random" else "")
+    return "map-%dx%d-%g%s-%d-%06d%s" % (options.rows, options.cols, options.density, flags, options.seed, index,
+                                         EXTENSIONS[options.fmt])
+
+
+def map_path(options: GenerateOptions, index: int) -> str:
+    return os.path.join(options.output, map_name(options, index))
+
+
+def generate_board(options: GenerateOptions, index: int) -> MinesweeperMap:
+    seed: int = board_seed(options.seed, index)
+    game: MinesweeperMap = MinesweeperMap(options.rows, options.density, seed, cols = options.cols,
+                                          no_guess = options.no_guess)
+    if options.first_click == "random":
+        rng: random.Random = random.Random(click_seed(options.seed, index))
+        game.generate_map(rng.randrange(options.rows), rng.randrange(options.cols))
+    else:
+        game.generate_map(options.rows // 2, options.cols // 2)
+    return game
+
+
+def write_board(options: GenerateOptions, index: int) -> int:
+    game: MinesweeperMap = generate_board(options, index)
+    path: str = map_path(options, index)
+    if options.fmt == "binary":
+        with open(path, "wb", buffering = WRITE_BUFFER_SIZE) as fil:
+            export.write_binary(game, fil)
+            return fil.tell()
+    with open(path, "w", buffering = WRITE_BUFFER_SIZE) as fil:
+        export.write_text(game, fil.write)
+        return fil.tell()
+
+
+def write_boards(options: GenerateOptions, indices: range) -> Tuple[int, int]:
+    # Returns how many boards and bytes were written.
+    written: int = 0
+    i: int
+    for i in indices:
+        written += write_board(options, i)
+    return len(indices), written
+
+
+def generate(options: GenerateOptions, count: int, workers: int = None,
+             chunksize: int = None) -> Iterator[Tuple[int, int]]:
+    # Yields (boards, bytes) per finished chunk, in index order.
+    if options.fmt not in FORMATS:
+        raise ValueError("unknown map format " + options.fmt)
+    os.makedirs(options.output, exist_ok = True)
+    workers = workers or os.cpu_count() or 1
+    indices: range = range(count)
+    if chunksize is None:
+        chunksize = max(1, min(256, count // (workers * 8)))
+    chunks: List[range] = list(chunk_seeds(indices, chunksize))
+    if workers == 1:
+        chunk: range
+        for chunk in chunks:
+            yield write_boards(options, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        yield from pool.map(write_boards, [options] * len(chunks), chunks)
@@ -0,0 +1,72 @@
+from array import array
+from functools import lru_cache
+from operator import add
+from typing import List
+
+MINE: int = -1
+
+
+@lru_cache(maxsize = None)
+def load_numpy():
+    # NumPy is optional and takes longer to import than the whole engine, so
+    # it is only imported by the first caller that needs it. None when it is
+    # not installed.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def compute_hints(values, rows: int, cols: int, use_numpy: bool = None):
+    # Fills every non-mine cell of the flat, row-major `values` buffer with the
+    # number of mines among its 8 neighbors. Mines (-1) are left untouched.
+    if use_numpy is None:
+        use_numpy = load_numpy() is not None
+    if use_numpy:
+        if load_numpy() is None:
+            raise ImportError("NumPy is not installed")
+        _compute_hints_numpy(values, rows, cols)
+    else:
+        _compute_hints_python(values, rows, cols)
+    return values
+
+
+def _compute_hints_numpy(values, rows: int, cols: int):
+    numpy = load_numpy()
+    grid = numpy.frombuffer(values, dtype = numpy.int8).reshape(rows, cols)
+    mines = grid == MINE
+    padded = numpy.zeros((rows + 2, cols + 2), dtype = numpy.int8)
+    padded[1:-1, 1:-1] = mines
+    counts = numpy.zeros((rows, cols), dtype = numpy.int8)
+    dx: int
+    for dx in range(3):
+        dy: int
+        for dy in range(3):
+            counts += padded[dx:dx + rows, dy:dy + cols]
+    grid[...] = numpy.where(mines, MINE, counts)
+
+
+def _compute_hints_python(values, rows: int, cols: int):
+    # Column sums over a sliding window of three mine-mask rows, then a
+    # horizontal 3-wide sum of those column sums gives the 3x3 neighborhood.
+    zeros: List[int] = [0] * cols
+    masks: List[List[int]] = [zeros, _mine_mask(values, 0, cols) if rows else zeros]
+    x: int
+    for x in range(rows):
+        below: List[int] = _mine_mask(values, (x + 1) * cols, cols) if x + 1 < rows else zeros
+        above, current = masks
+        base: int = x * cols
+        values[base:base + cols] = array("b", hint_row(above, current, below))
+        masks = [current, below]
+
+
+def hint_row(above: List[int], current: List[int], below: List[int]) -> List[int]:
+    # Values of one row given the 0/1 mine masks of it and its two neighbors.
+    column_sums: List[int] = [0] + list(map(add, map(add, above, current), below)) + [0]
+    counts = map(add, map(add, column_sums[:-2], column_sums[1:-1]), column_sums[2:])
+    return [MINE if mine else count for mine, count in zip(current, counts)]
+
+
+def _mine_mask(values, base: int, cols: int) -> List[int]:
+    return [1 if v == MINE else 0 for v in values[base:base + cols]]
@@ -0,0 +1,169 @@
+import cProfile
+import functools
+import json
+import pstats
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, TextIO, Tuple
+from . import export, minesweepermap, savefile
+from .minesweepermap import MinesweeperMap
+
+# Opt-in timing of the hot paths. enable() swaps timing wrappers in for the
+# methods and functions below and disable() puts the originals back, so a
+# session that never enables instrumentation runs the unpatched code.
+METHODS: List[str] = ["generate_map", "generate_bombs", "generate_hints", "reveal", "flag", "toggle_flag",
+                      "apply", "apply_batch", "move_codes", "validate_move", "get_play_str", "get_map_str",
+                      "map_revealed", "save_map", "export_map", "stream_export"]
+# Chords are applied by apply_batch; chord_cells finds the cells they open.
+FUNCTIONS: List[Tuple[object, str]] = [(minesweepermap, "chord_cells"), (savefile, "save_game"),
+                                       (savefile, "load_game"), (export, "write_binary")]
+SAMPLE_LIMIT: int = 10000
+PERCENTILES: Tuple[int, ...] = (50, 90, 99)
+
+
+class Timing:
+    # Latencies keep the most recent SAMPLE_LIMIT calls for percentiles;
+    # calls and total cover every call.
+    __slots__ = ("calls", "total", "cells", "samples")
+
+    def __init__(self):
+        self.calls: int = 0
+        self.total: float = 0.0
+        self.cells: int = 0
+        self.samples: Deque[float] = deque(maxlen = SAMPLE_LIMIT)
+
+    def summary(self) -> Dict:
+        samples: List[float] = sorted(self.samples)
+        summary: Dict = {"calls": self.calls, "total": self.total,
+                         "mean": self.total / self.calls if self.calls else 0.0,
+                         "max": samples[-1] if samples else 0.0}
+        p: int
+        for p in PERCENTILES:
+            summary["p" + str(p)] = samples[(len(samples) - 1) * p // 100] if samples else 0.0
+        if self.cells:
+            summary["cells"] = self.cells
+            summary["cells_per_call"] = self.cells / self.calls
+        return summary
+
+
+timings: Dict[str, Timing] = {}
+originals: Dict[Tuple[object, str], Callable] = {}
+lock: threading.Lock = threading.Lock()
+
+
+def record(name: str, elapsed: float, cells: int = 0):
+    with lock:
+        timing: Optional[Timing] = timings.get(name)
+        if timing is None:
+            timing = timings[name] = Timing()
+        timing.calls += 1
+        timing.total += elapsed
+        timing.cells += cells
+        timing.samples.append(elapsed)
+
+
+def timed(name: str, func: Callable) -> Callable:
+    # reveal returns (value, cells revealed); the count is kept as cells
+    # touched so flood fills can be told apart from single-cell reveals.
+    counts_cells: bool = name == "reveal"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start: float = time.perf_counter()
+        result = func(*args, **kwargs)
+        record(name, time.perf_counter() - start, result[1] if counts_cells else 0)
+        return result
+
+    return wrapper
+
+
+def enabled() -> bool:
+    return bool(originals)
+
+
+def enable():
+    if enabled():
+        return
+    name: str
+    for name in METHODS:
+        originals[(MinesweeperMap, name)] = MinesweeperMap.__dict__[name]
+        setattr(MinesweeperMap, name, timed(name, MinesweeperMap.__dict__[name]))
+    for module, name in FUNCTIONS:
+        originals[(module, name)] = getattr(module, name)
+        setattr(module, name, timed(module.__name__.rpartition(".")[2] + "." + name, getattr(module, name)))
+
+
+def disable():
+    for (owner, name), func in originals.items():
+        setattr(owner, name, func)
+    originals.clear()
+
+
+def reset():
+    with lock:
+        timings.clear()
+
+
+def stats() -> Dict[str, Dict]:
+    with lock:
+        return {name: timing.summary() for name, timing in sorted(timings.items())}
+
+
+def format_stats(snapshot: Dict[str, Dict] = None) -> str:
+    snapshot = stats() if snapshot is None else snapshot
+    lines: List[str] = ["%-22s %8s %10s %10s %10s %10s %10s" % ("name", "calls", "total ms", "p50 ms", "p90 ms",
+                                                               "p99 ms", "cells/call")]
+    name: str
+    summary: Dict
+    for name, summary in snapshot.items():
+        lines.append("%-22s %8d %10.2f %10.3f %10.3f %10.3f %10s" % (
+            name, summary["calls"], 1000 * summary["total"], 1000 * summary["p50"], 1000 * summary["p90"],
+            1000 * summary["p99"], "%.1f" % summary["cells_per_call"] if "cells_per_call" in summary else "-"))
+    return "\n".join(lines) + "\n"
+
+
+class PeriodicDump:
+    # Appends a JSON snapshot of stats() to fil every interval seconds from a
+    # daemon thread, and once more on stop().
+    def __init__(self, fil: TextIO, interval: float = 10.0):
+        self.fil: TextIO = fil
+        self.interval: float = interval
+        self.stopped: threading.Event = threading.Event()
+        self.thread: threading.Thread = threading.Thread(target = self.run, daemon = True)
+
+    def dump(self):
+        self.fil.write(json.dumps({"time": time.time(), "stats": stats()}) + "\n")
+        self.fil.flush()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.dump()
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+        self.dump()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def profile(func: Callable, path: str = None, out: TextIO = None, sort: str = "cumulative", limit: int = 30):
+    # Runs func under cProfile. The raw profile goes to path for later
+    # analysis (e.g. with snakeviz); a summary is printed to out.
+    profiler: cProfile.Profile = cProfile.Profile()
+    try:
+        return profiler.runcall(func)
+    finally:
+        if path is not None:
+            profiler.dump_stats(path)
+        if out is not None:
+            pstats.Stats(profiler, stream = out).sort_stats(sort).print_stats(limit)
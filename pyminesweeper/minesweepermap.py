@@ -1,42 +1,144 @@
+from array import array
 import random
-import math
-from datetime import datetime
-import enum
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, NamedTuple, Set, Tuple
+from .board import Board, State, HIDDEN, REVEALED, FLAGGED, MINE
+from .export import write_text
+from .hints import compute_hints
+from .placement import new_seed, number_of_mines, place_mines, safe_cells
+from .render import BoardRenderer
+from .reveal import chord_cells, flood_from, flood_reveal
+
+# Moves as flat codes, (x * cols + y) << 2 | op, as apply_batch takes them
+# and move logs store them.
+REVEAL: int = 0
+FLAG: int = 1
+CHORD: int = 2
+OPS: Dict[str, int] = {"r": REVEAL, "f": FLAG, "c": CHORD}
 
 
-@enum.unique
-class State(enum.Enum):
-    HIDDEN: int = 0
-    REVEALED: int = 1
-    FLAGGED: int = 2
+class Map:
+    # Thin view of a single cell of a Board, kept for callers of the old grid API.
+    __slots__ = ("board", "index")
 
+    def __init__(self, board: Board = None, index: int = 0):
+        self.board: Board = board if board is not None else Board(1, 1)
+        self.index: int = index
 
-class Map:
-    def __init__(self):
-        self.val: int = 0
-        self.state: State = State.HIDDEN
+    @property
+    def val(self) -> int:
+        return self.board.values[self.index]
+
+    @val.setter
+    def val(self, val: int):
+        self.board.values[self.index] = val
+
+    @property
+    def state(self) -> State:
+        return State(self.board.states[self.index])
+
+    @state.setter
+    def state(self, state: State):
+        self.board.states[self.index] = state.value
+
+
+class MapRow:
+    __slots__ = ("board", "x")
+
+    def __init__(self, board: Board, x: int):
+        self.board: Board = board
+        self.x: int = x
+
+    def __len__(self) -> int:
+        return self.board.cols
+
+    def __getitem__(self, y: int) -> Map:
+        if y < 0:
+            y += self.board.cols
+        if not 0 <= y < self.board.cols:
+            raise IndexError("map column out of range")
+        return Map(self.board, self.board.index(self.x, y))
+
+    def __iter__(self):
+        y: int
+        for y in range(self.board.cols):
+            yield Map(self.board, self.board.index(self.x, y))
+
+
+class MapGrid:
+    # Read-through List[List[Map]] lookalike over a Board.
+    __slots__ = ("board",)
+
+    def __init__(self, board: Board):
+        self.board: Board = board
+
+    def __len__(self) -> int:
+        return self.board.rows
+
+    def __getitem__(self, x: int) -> MapRow:
+        if x < 0:
+            x += self.board.rows
+        if not 0 <= x < self.board.rows:
+            raise IndexError("map row out of range")
+        return MapRow(self.board, x)
+
+    def __iter__(self):
+        x: int
+        for x in range(self.board.rows):
+            yield MapRow(self.board, x)
+
+
+class MoveResult(NamedTuple):
+    changed: array
+    life_lost: bool
+    result: int
+
+
+class BatchResult(NamedTuple):
+    changed: array
+    lives_lost: int
+    result: int
+    # Moves applied; the rest of a batch is dropped once the game ends.
+    applied: int
 
 
 class MinesweeperMap:
-    def __init__(self, size: int):
-        self.size: int = size
-        self.init_map()
+    def __init__(self, size: int, density: float = 0.15, seed: int = None, safe_neighborhood: bool = False,
+                 board: Board = None, cols: int = None, no_guess: bool = False, pool = None):
+        self.size: int = size if board is None else board.rows
+        self.rows: int = self.size
+        self.cols: int = self.size if cols is None else cols
+        if board is not None:
+            self.cols = board.cols
+        self.init_map(board)
+        self.generated: bool = False
+        self.result: int = 0
+        self.last_changed: array = self.board.index_array()
         self.turns: int = 0
         self.flags: int = 0
         self.lives: int = 3
-        self.num_mines: int = math.ceil(0.15 * (self.size ** 2))
+        self.density: float = density
+        self.seed: int = new_seed() if seed is None else seed
+        self.safe_neighborhood: bool = safe_neighborhood
+        # No-guess boards come ready-made from pool (a noguess.BoardPool) when
+        # it has one for the first click, else they are generated on it.
+        self.no_guess: bool = no_guess or pool is not None
+        self.pool = pool
+        self.pooled: bool = False
+        # A replay.MoveLog attached by replay.record; sees every applied move.
+        self.recorder = None
+        self.num_mines: int = number_of_mines(self.rows, self.cols, density)
+        self.remaining: int = (self.rows * self.cols) - self.num_mines
         if self.num_mines < 4:
             self.lives = max(1, self.num_mines - 1) 
 
     def is_flagged(self, x: int, y: int) -> bool:
-        return self.map[x][y].state is State.FLAGGED
+        return self.board.states[x * self.board.cols + y] == FLAGGED
 
     def is_revealed(self, x: int, y: int) -> bool:
-        return self.map[x][y].state is State.REVEALED
+        return self.board.states[x * self.board.cols + y] == REVEALED
 
     def is_hidden(self, x: int, y: int) -> bool:
-        return self.map[x][y].state is State.HIDDEN
+        return self.board.states[x * self.board.cols + y] == HIDDEN
 
     def number_of_lives(self) -> int:
         return self.lives
@@ -53,68 +155,69 @@ class MinesweeperMap:
     def change_number_of_lives(self, lives: int):
         self.lives = lives
 
-    def init_map(self):
-        self.map: List[List[Map]] = [[Map() for _ in range(self.size)] for _ in range(self.size)]
-
-    def generate_bombs(self, x: int, y: int):
-        random.seed(datetime.now())
+    def init_map(self, board: Board = None):
+        self.board: Board = Board(self.rows, self.cols) if board is None else board
+        self.renderer: BoardRenderer = BoardRenderer(self.board)
 
-        for _ in range(self.num_mines):
-            i: int = random.randrange(0, self.size)
-            j: int = random.randrange(0, self.size)
-            random.seed(datetime.now())
+    @property
+    def map(self) -> MapGrid:
+        return MapGrid(self.board)
 
-            while self.map[i][j].val is -1 or (x is i and y is j):
-                i = random.randrange(0, self.size)
-                j = random.randrange(0, self.size)
-                random.seed(datetime.now())
+    def generate_bombs(self, x: int, y: int, rng: random.Random = None):
+        rows: int = self.board.rows
+        cols: int = self.board.cols
+        excluded: Set[int] = safe_cells(rows, cols, x, y, self.safe_neighborhood)
+        if rows * cols - len(excluded) < self.num_mines:
+            excluded = safe_cells(rows, cols, x, y)
 
-            self.map[i][j].val = -1
+        values = self.board.values
+        i: int
+        for i in place_mines(rows, cols, self.num_mines, excluded, rng or random.Random(self.seed)):
+            values[i] = MINE
 
     def generate_hints(self):
-        i, j = 0, 0
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.map[i][j].val is not -1:
-                    self.map[i][j].val += self.nearby_bombs(i, j)
+        compute_hints(self.board.values, self.board.rows, self.board.cols)
 
     def nearby_bombs(self, i: int, j: int) -> int:
+        values = self.board.values
+        rows: int = self.rows
+        n: int = self.cols
         num_bombs: int = 0
         if i > 0:
-            num_bombs += 1 if self.map[i - 1][j].val is -1 else 0
+            num_bombs += 1 if values[(i - 1) * n + j] == MINE else 0
 
-        if i < self.size - 1:
-            num_bombs += 1 if self.map[i + 1][j].val is -1 else 0
+        if i < rows - 1:
+            num_bombs += 1 if values[(i + 1) * n + j] == MINE else 0
 
         if j > 0:
-            num_bombs += 1 if self.map[i][j - 1].val is -1 else 0
+            num_bombs += 1 if values[i * n + j - 1] == MINE else 0
 
-        if j < self.size - 1:
-            num_bombs += 1 if self.map[i][j + 1].val is -1 else 0
+        if j < n - 1:
+            num_bombs += 1 if values[i * n + j + 1] == MINE else 0
 
         if i > 0 and j > 0:
-            num_bombs += 1 if self.map[i - 1][j - 1].val is -1 else 0
+            num_bombs += 1 if values[(i - 1) * n + j - 1] == MINE else 0
 
-        if i > 0 and j < self.size - 1:
-            num_bombs += 1 if self.map[i - 1][j + 1].val is -1 else 0
+        if i > 0 and j < n - 1:
+            num_bombs += 1 if values[(i - 1) * n + j + 1] == MINE else 0
 
-        if i < self.size - 1 and j > 0:
-            num_bombs += 1 if self.map[i + 1][j - 1].val is -1 else 0
+        if i < rows - 1 and j > 0:
+            num_bombs += 1 if values[(i + 1) * n + j - 1] == MINE else 0
 
-        if i < self.size - 1 and j < self.size - 1:
-            num_bombs += 1 if self.map[i + 1][j + 1].val is -1 else 0
+        if i < rows - 1 and j < n - 1:
+            num_bombs += 1 if values[(i + 1) * n + j + 1] == MINE else 0
 
         return num_bombs
 
     def validate_input(self, x: int, y: int) -> bool:
-        return x >= 1 and x <= self.size and y >= 1 and y <= self.size
+        return x >= 1 and x <= self.rows and y >= 1 and y <= self.cols
 
     def validate_mode(self, m: str) -> bool:
-        return m is "r" or m is "f" or m is "q"
+        return m == "r" or m == "f" or m == "c" or m == "q" or m == "v"
 
     def validate_move(self, move: str) -> Tuple[bool, str, int, int]:
         move_list: List[str] = move.split()
-        if len(move_list) is 3:
+        if len(move_list) == 3:
             m = move_list[0]
             if self.validate_mode(move_list[0]):
                 try:
@@ -124,7 +227,7 @@ class MinesweeperMap:
                         return (False, m, (x - 1), (y - 1))
                 except:
                     return (True, "", -1, -1)
-        elif len(move_list) is 1 and move_list[0] is "q":
+        elif len(move_list) == 1 and move_list[0] == "q":
             return (False, "q", -1, -1)
         return (True, "", -1, -1)
 
@@ -134,33 +237,27 @@ class MinesweeperMap:
         stats_str += "Turns taken: " + str(self.turns) + "\t"
         stats_str += "Flagged places: " + str(self.flags) + "\t"
         stats_str += "Number of Mines: " + str(self.num_mines)
+        if self.renderer.is_partial():
+            stats_str += "\n" + self.renderer.viewport_str()
         stats_str += "\n\n"
         return stats_str
 
     def get_map_str(self) -> str:
-        map_str: str = ""
-        i: int
-        for i in range(self.size):
-            j: int
-            for j in range(self.size):
-                if self.map[i][j].state is State.FLAGGED:
-                    map_str += "[|>]\t"
-                elif self.map[i][j].state is State.REVEALED:
-                    map_str += ((" " + str(self.map[i][j].val)) if self.map[i][j].val is not -1 else "[X] ") + "\t"
-                else:
-                    map_str += "[ ] \t"
-            map_str += "\n"
-        return map_str
+        return self.renderer.render()
+
+    def set_viewport(self, rows: int, cols: int):
+        self.renderer.resize(rows, cols)
+
+    def scroll_viewport(self, x: int, y: int):
+        self.renderer.scroll_to(x, y)
 
     def map_revealed(self) -> str:
-        map_revealed_str: str = ""
+        return "".join(self.iter_map_revealed())
+
+    def iter_map_revealed(self) -> Iterator[str]:
         i: int
-        for i in range(self.size):
-            j: int
-            for j in range(self.size):
-                map_revealed_str += (str(self.map[i][j].val) if self.map[i][j].val is not -1 else "X") + " "
-            map_revealed_str += "\n"
-        return map_revealed_str
+        for i in range(self.rows):
+            yield self.board.revealed_row_str(i)
 
     def accept_input(self) -> Tuple[str, int, int]:
         move: str = input(":")
@@ -177,68 +274,273 @@ class MinesweeperMap:
         return m, x, y
 
     def reveal(self, x: int, y: int, num_revealed = 0) -> Tuple[int, int]:
-        already_revealed: bool
-        if self.map[x][y].state is not State.REVEALED:
-            already_revealed = False
-
-            if self.map[x][y].state is State.FLAGGED:
-                self.flags -= 1
-
-            self.map[x][y].state = State.REVEALED
-
-            if self.map[x][y].val is 0:
-                if x < self.size - 1 and self.map[x + 1][y].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x + 1, y, num_revealed)
-
-                if x > 0 and self.map[x - 1][y].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x - 1, y, num_revealed)
-
-                if y > 0 and self.map[x][y - 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x, y - 1, num_revealed)
-
-                if y < self.size - 1 and self.map[x][y + 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x, y + 1, num_revealed)
-
-                if x > 0 and y > 0 and self.map[x - 1][y - 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x - 1, y - 1, num_revealed)
-
-                if x > 0 and y < self.size - 1 and self.map[x - 1][y + 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x - 1, y + 1, num_revealed)
-
-                if x < self.size - 1 and y > 0 and self.map[x + 1][y - 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x + 1, y - 1, num_revealed)
-
-                if x < self.size - 1 and y < self.size - 1 and self.map[x + 1][y + 1].state is not State.REVEALED:
-                    _, num_revealed = self.reveal(x + 1, y + 1, num_revealed)
-
-        return self.map[x][y].val, num_revealed + (0 if already_revealed else 1)
+        val: int
+        revealed: int
+        flags_cleared: int
+        val, revealed, self.last_changed, flags_cleared = flood_reveal(self.board, x, y)
+        self.flags -= flags_cleared
+        if val != MINE:
+            self.remaining -= revealed
+        self.renderer.invalidate(self.last_changed)
+        return val, num_revealed + revealed
 
     def flag(self, x: int, y: int):
-        if self.map[x][y].state is State.REVEALED:
+        if not self.toggle_flag(x, y):
             print("Invalid location: Already revealed")
-        elif self.map[x][y].state is State.FLAGGED:
-            self.map[x][y].state = State.HIDDEN
+
+    def toggle_flag(self, x: int, y: int) -> bool:
+        states = self.board.states
+        i: int = x * self.cols + y
+        if states[i] == REVEALED:
+            return False
+        if states[i] == FLAGGED:
+            states[i] = HIDDEN
             self.flags -= 1
         else:
-            self.map[x][y].state = State.FLAGGED
+            states[i] = FLAGGED
             self.flags += 1
+        self.renderer.invalidate_row(x)
+        return True
+
+    def reset(self):
+        # Back to an ungenerated board with the counters of a new game.
+        cells: int = len(self.board)
+        self.board.values[:] = array("b", bytes(cells))
+        self.board.states[:] = bytearray(cells)
+        self.generated = False
+        self.pooled = False
+        self.result = 0
+        self.last_changed = self.board.index_array()
+        self.turns = 0
+        self.flags = 0
+        self.lives = 3 if self.num_mines >= 4 else max(1, self.num_mines - 1)
+        self.remaining = cells - self.num_mines
+        self.renderer.invalidate_all()
+
+    def new_game(self, first_click: Tuple[int, int]) -> MoveResult:
+        # Starts over if this game was already played on.
+        if self.generated or self.turns:
+            if self.recorder is not None:
+                raise ValueError("a recorded game cannot be started over")
+            self.reset()
+        self.generate_map(*first_click)
+        return self.apply(("r",) + tuple(first_click))
+
+    def apply(self, move) -> MoveResult:
+        # Applies one move, given as a (mode, x, y) tuple with 0-indexed
+        # coordinates or as a move string like "r 1 1", without rendering.
+        if isinstance(move, str):
+            err: bool
+            err, m, x, y = self.validate_move(move)
+            if err:
+                raise ValueError("invalid move: " + move)
+        else:
+            m, x, y = move
+            if m != "q" and not self.validate_input(x + 1, y + 1):
+                raise ValueError("move outside the board: " + str(move))
+        if self.result != 0:
+            raise ValueError("the game is over")
+
+        changed: array = self.board.index_array()
+        life_lost: bool = False
+        if m == "r":
+            if not self.generated:
+                self.generate_map(x, y)
+            val: int
+            val, _ = self.reveal(x, y)
+            changed = self.last_changed
+            if val == MINE and changed:
+                if self.lives > 0:
+                    self.lives -= 1
+                    life_lost = True
+                else:
+                    self.result = -1
+            elif self.remaining == 0:
+                self.result = 1
+            self.turns += 1
+        elif m == "f":
+            if self.toggle_flag(x, y):
+                changed = self.board.index_array([x * self.cols + y])
+            if self.generated:
+                self.turns += 1
+        elif m == "c":
+            # Recorded by apply_batch.
+            batch: BatchResult = self.apply_batch(((m, x, y),))
+            changed = batch.changed
+            life_lost = batch.lives_lost > 0
+        elif m == "v":
+            self.scroll_viewport(x, y)
+        elif m != "q":
+            raise ValueError("invalid move mode: " + str(m))
+        if self.recorder is not None and m != "v" and m != "q" and m != "c":
+            self.recorder.record(m, x, y)
+        return MoveResult(changed, life_lost, self.result)
+
+    def move_codes(self, moves) -> array:
+        # Flat codes of reveal, flag and chord moves given as (mode, x, y)
+        # tuples, move strings or codes, checked before any is applied.
+        if isinstance(moves, array) and moves.typecode == "q":
+            codes: array = moves
+        else:
+            if hasattr(moves, "tolist"):
+                moves = moves.tolist()
+            codes = array("q")
+            for move in moves:
+                if isinstance(move, int):
+                    codes.append(move)
+                    continue
+                if isinstance(move, str):
+                    err: bool
+                    err, m, x, y = self.validate_move(move)
+                    if err:
+                        raise ValueError("invalid move: " + move)
+                else:
+                    m, x, y = move
+                if m not in OPS:
+                    raise ValueError("invalid batch move mode: " + str(m))
+                if not self.validate_input(x + 1, y + 1):
+                    raise ValueError("move outside the board: " + str(move))
+                codes.append((x * self.cols + y) << 2 | OPS[m])
+        limit: int = len(self.board) << 2
+        code: int
+        for code in codes:
+            if code < 0 or code >= limit or code & 3 > CHORD:
+                raise ValueError("invalid move code %d" % code)
+        return codes
+
+    def apply_batch(self, moves) -> BatchResult:
+        # Applies reveal, flag and chord moves in order in one pass, with the
+        # rules of apply, and renders nothing until the end. All openings
+        # share one changed buffer, and the state buffer marks what any
+        # earlier move revealed, so overlapping flood fills visit each cell
+        # once. The counters are kept in locals and stored once, and all
+        # changed cells come back as one set.
+        if self.result != 0:
+            raise ValueError("the game is over")
+        codes: array = self.move_codes(moves)
+        board: Board = self.board
+        states = board.states
+        values = board.values
+        cols: int = self.cols
+        lives: int = self.lives
+        turns: int = self.turns
+        flags: int = self.flags
+        # Safe cells left once the mines revealed so far are discounted from
+        # changed, which only ever grows by revealed cells.
+        remaining: int = self.remaining
+        result: int = 0
+        changed: array = board.index_array()
+        toggled: List[int] = []
+        mines: int = 0
+        lives_lost: int = 0
+        applied: int = 0
+        code: int
+        for code in codes:
+            i: int = code >> 2
+            op: int = code & 3
+            if op == FLAG:
+                state: int = states[i]
+                if state != REVEALED:
+                    states[i] = HIDDEN if state == FLAGGED else FLAGGED
+                    flags += -1 if state == FLAGGED else 1
+                    toggled.append(i)
+                if self.generated:
+                    turns += 1
+            else:
+                if op == REVEAL:
+                    if not self.generated:
+                        self.generate_map(i // cols, i % cols)
+                    hits: List[int] = [i]
+                else:
+                    # Safe cells first, so a chord that also hits a wrongly
+                    # flagged mine still opens the rest.
+                    hits = chord_cells(board, i)
+                    if len(hits) > 1:
+                        hits.sort(key = lambda j: values[j] == MINE)
+                j: int
+                for j in hits:
+                    state = states[j]
+                    if state == REVEALED:
+                        continue
+                    if values[j] == MINE and len(changed) - mines == remaining:
+                        # The safe cells already won the game.
+                        break
+                    if state == FLAGGED:
+                        flags -= 1
+                    states[j] = REVEALED
+                    changed.append(j)
+                    if values[j] == 0:
+                        flags -= flood_from(board, [j], changed)
+                    elif values[j] == MINE:
+                        mines += 1
+                        if lives > 0:
+                            lives -= 1
+                            lives_lost += 1
+                        else:
+                            result = -1
+                            break
+                if result == 0 and len(changed) - mines == remaining:
+                    result = 1
+                if op == REVEAL or self.generated:
+                    turns += 1
+            applied += 1
+            if self.recorder is not None:
+                self.recorder.record("rfc"[op], i // cols, i % cols)
+            if result != 0:
+                break
+
+        self.lives = lives
+        self.turns = turns
+        self.flags = flags
+        self.remaining = remaining - (len(changed) - mines)
+        self.result = result
+        if toggled:
+            changed = board.index_array(dict.fromkeys(changed + board.index_array(toggled)))
+        self.last_changed = changed
+        self.renderer.invalidate(changed)
+        return BatchResult(changed, lives_lost, result, applied)
 
     def get_play_str(self) -> str:
-        play_str: str = ""
-        play_str += self.get_stats_str()
-        play_str += self.get_map_str()
-        return play_str 
+        return self.get_stats_str() + self.get_map_str()
 
     def generate_map(self, x: int, y: int):
-        self.generate_bombs(x, y)
-        self.generate_hints()
+        if self.no_guess:
+            self.generate_no_guess(x, y)
+        else:
+            self.generate_bombs(x, y)
+            self.generate_hints()
+        self.generated = True
+
+    def generate_no_guess(self, x: int, y: int):
+        # noguess imports this module, so it is imported on first use.
+        from .noguess import generate_no_guess
+
+        ready = None
+        if self.pool is not None:
+            ready = self.pool.take(self.rows, self.cols, self.density, x, y)
+        if ready is not None:
+            self.seed = ready.seed
+            self.pooled = True
+            self.board.values[:] = array("b", ready.values)
+        else:
+            self.board.values[:] = generate_no_guess(self.rows, self.cols, self.num_mines, x, y,
+                                                     random.Random(self.seed))
 
     def save_map(self, out = print):
         out(str(self.size) + "\n" + self.get_play_str() + self.map_revealed())
 
     def export_map(self, out = print):
-        self.generate_map(self.size//2, self.size//2)
-        out(str(self.size) + " " + str(self.num_mines) + "\n" + self.map_revealed())
+        self.generate_map(self.rows//2, self.cols//2)
+        out(self.export_header() + self.map_revealed())
+
+    def export_header(self) -> str:
+        if self.rows == self.cols:
+            return str(self.size) + " " + str(self.num_mines) + "\n"
+        return str(self.rows) + " " + str(self.cols) + " " + str(self.num_mines) + "\n"
+
+    def stream_export(self, write: Callable[[str], object]):
+        self.generate_map(self.rows//2, self.cols//2)
+        write_text(self, write)
 
     def play(self, out = print) -> int:
         result: int = 0
@@ -248,45 +550,26 @@ class MinesweeperMap:
         y: int
         m, x, y = self.accept_input()
 
-        if m is not "q":
-            while m is not "r":
-                self.flag(x, y)
-                out(self.get_play_str())        
-                m, x, y = self.accept_input()
-
-            self.generate_map(x, y)
-            remaining_loc: int = (self.size ** 2) - self.num_mines
-
-            while m is not "q":
-                if m is "r":
-                    val: int
-                    locs_revealed: int
-                    val, locs_revealed = self.reveal(x, y)
-                    if val is -1:
-                        if self.lives > 0:
-                            self.lives -= 1
-                            out("1 life lost!")
-                            out("\n")
-                        else:
-                            result = -1
-                    else:
-                        remaining_loc -= locs_revealed
-                        if remaining_loc is 0:
-                            result = 1
-                else:
-                    self.flag(x, y)
-                self.turns += 1
-                out(self.get_play_str())
+        while m != "q":
+            move: MoveResult = self.apply((m, x, y))
+            if m == "f" and not move.changed:
+                out("Invalid location: Already revealed")
+            if move.life_lost:
+                out("1 life lost!")
+                out("\n")
+            out(self.get_play_str())
+            if m != "v" and self.generated:
                 out("\n")
-                if result is not 0:
-                    break
-                m, x, y = self.accept_input()
+            result = move.result
+            if result != 0:
+                break
+            m, x, y = self.accept_input()
 
-        if m is "q":
+        if m == "q":
             result = 0
             out("Be back soon!")
         else:
-            out("Congrats!" if result is 1 else "Better luck next time!")
+            out("Congrats!" if result == 1 else "Better luck next time!")
         out("\n")
 
         return result
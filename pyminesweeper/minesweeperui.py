@@ -1,7 +1,9 @@
 from .minesweepermap import MinesweeperMap
+from . import savefile
 import colorama
 import enum
 import os
+import time
 from typing import List, Tuple
 
 
@@ -9,16 +11,25 @@ from typing import List, Tuple
 class MenuOptions(enum.Enum):
     PLAY: int = "1"
     EXPORT: int = "2"
-    # LOAD: int = "3"
-    HOWTO: int = "3"
-    ABOUT: int = "4"
-    EXIT: int = "5"
+    LOAD: int = "3"
+    HOWTO: int = "4"
+    ABOUT: int = "5"
+    EXIT: int = "6"
 
 
+VIEWPORT_SIZE: int = 40
+EXPORT_BUFFER_SIZE: int = 1 << 16
+
 
 class MinesweeperUI:
-    def __init__(self):
+    def __init__(self, pool = None, record_dir: str = None):
+        # With a noguess.BoardPool every new game is a no-guess board; with
+        # record_dir every new game's moves are logged there for replay.
         colorama.init(autoreset = True)
+        self.pool = pool
+        self.record_dir: str = record_dir
+        # The save the current game was loaded from; saving replaces it.
+        self.save_name: str = None
 
     def print_welcome(self):
         print(colorama.Style.BRIGHT + colorama.Fore.BLUE + r"""
@@ -54,12 +65,27 @@ class MinesweeperUI:
         print("             \"f 1 1\" later will unflag the tile at the coordinates (1, 1) which is the top left tile.")
         self.print_whitespace(1)
 
+    def print_chord_instructions(self):
+        self.print_header("Chord mode: c")
+        print(("Reveals every unflagged neighbor of a revealed number tile that has exactly that many flagged"
+               " neighbors. Nothing happens otherwise. A wrongly flagged neighbor means a bomb gets revealed, costing a"
+               " life like revealing it directly."))
+        print("For example: \"c 1 1\" will reveal the unflagged neighbors of the tile at the coordinates (1, 1).")
+        self.print_whitespace(1)
+
     def print_quit_instructions(self):
         self.print_header("Quit: q")
         print("Quits the game at any time. Goes back to the menu.")
         print("For example: \"q\" will quit the game that instant and get you back to the menu.")
         self.print_whitespace(1)
 
+    def print_view_instructions(self):
+        self.print_header("View mode: v")
+        print(("Maps larger than " + str(VIEWPORT_SIZE) + "x" + str(VIEWPORT_SIZE) + " only show a window of the map at a"
+               " time. Moves the top left corner of the window to the given tile. Does not count as a turn."))
+        print("For example: \"v 41 1\" will show the window starting at the 41st row and the 1st column.")
+        self.print_whitespace(1)
+
     def print_coordinate_instructions(self):
         self.print_header("Entering coordinates: [x coordinate] [y coordinate]")
         print(("[x coordinate] is the number of the row of the cell and [y coordinate] is the number of the"
@@ -92,7 +118,7 @@ class MinesweeperUI:
     def print_load_instructions(self):
         self.print_header("Saving and loading Maps")
         print(("Maps are automatically saved when a game is ended before it ends. The name of file is the time"
-                " in milliseconds. A game can be loaded from the Menu when the game starts."))
+                " in milliseconds. A saved game can be loaded and continued from the Menu."))
         self.print_whitespace(1)
 
     def print_instructions(self):
@@ -104,7 +130,9 @@ class MinesweeperUI:
         self.print_coordinate_instructions()
         self.print_reveal_instructions()
         self.print_flag_instructions()
+        self.print_chord_instructions()
         self.print_quit_instructions()
+        self.print_view_instructions()
         self.print_load_instructions()
         self.print_winning_conditions()
         self.print_losing_conditions()
@@ -143,33 +171,36 @@ class MinesweeperUI:
         self.print_whitespace(1)
         print("2: Export a Map")
         self.print_whitespace(1)
-        print("3: How to Play Instructions")
+        print("3: Load a Game")
+        self.print_whitespace(1)
+        print("4: How to Play Instructions")
         self.print_whitespace(1)
-        print("4: About")
+        print("5: About")
         self.print_whitespace(1)
-        print("5: Exit")
+        print("6: Exit")
         self.print_whitespace(1)
 
     def export_map(self):
-        import time
-        fil = open(str(int(round(time.time() * 1000)))+".txt", "w")
-        self.game.export_map(out = fil.write)
-        fil.close()
+        stamp: int = int(round(time.time() * 1000))
+        while os.path.exists(str(stamp) + ".txt"):
+            stamp += 1
+        with open(str(stamp) + ".txt", "x", buffering = EXPORT_BUFFER_SIZE) as fil:
+            self.game.stream_export(fil.write)
         self.print_export_instructions()
         self.go_back_to_menu()
 
     def save_map(self):
-        import time
-        fil = open("saves/" + str(int(round(time.time() * 1000)))+".save", "w")
-        self.game.save_map(out = fil.write)
-        fil.close()
+        path: str = savefile.save_to_directory(self.game, name = self.save_name)
+        print("Game saved to " + path)
 
     def play(self):
         result = self.game.play(out = print)
-        if result is not 1:
+        if self.game.recorder is not None:
+            self.game.recorder.close()
+        if result != 1:
             print("Solution: ")
             self.print_all_revealed()
-        if result is 0:
+        if result == 0:
             self.save_map()
         self.go_back_to_menu()
 
@@ -225,14 +256,54 @@ class MinesweeperUI:
             is_valid_input, self.size_value = self.is_valid_size(size)
 
     def declare_minesweeper_map(self):
+        self.save_name = None
         self.get_size()
-        self.game: MinesweeperMap = MinesweeperMap(self.size_value)
+        self.game: MinesweeperMap = MinesweeperMap(self.size_value, pool = self.pool)
+        if self.pool is not None:
+            self.pool.prefetch(self.size_value, self.size_value, self.game.density)
+        if self.record_dir is not None:
+            from . import replay
+
+            os.makedirs(self.record_dir, exist_ok = True)
+            replay.record(self.game, os.path.join(self.record_dir, str(int(round(time.time() * 1000))) + ".log"))
+        if self.size_value > VIEWPORT_SIZE:
+            self.game.set_viewport(VIEWPORT_SIZE, VIEWPORT_SIZE)
+
+    def print_saves(self, saves: List[dict]):
+        self.print_header("SAVED GAMES")
+        self.print_whitespace(1)
+        num: int
+        for num, save in enumerate(saves, 1):
+            saved_at: str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(save["time"] / 1000))
+            print(str(num) + ": " + saved_at + "\tSize: " + str(save["size"]) + "x" + str(save["cols"])
+                  + "\tTurns taken: " + str(save["turns"]) + "\tLives remaining: " + str(save["lives"]))
+        self.print_whitespace(1)
+
+    def choose_save(self, saves: List[dict]) -> int:
+        choice: str = input("Choose game to load (0 to go back): ")
+        self.print_whitespace(1)
+        while not (choice.isdigit() and int(choice) <= len(saves)):
+            print("Please choose from valid options")
+            choice = input("Choose game to load (0 to go back): ")
+            self.print_whitespace(1)
+        return int(choice)
 
-    # def load_game(self):
-    #     #TODO display list of files in the saves folder with timings
-    #     #TODO accept input and validate it and get the file
-    #     #TODO parse the file 
-    #     pass
+    def load_game(self):
+        saves: List[dict] = savefile.list_saves()
+        if not saves:
+            print("No saved games found")
+            self.print_whitespace(1)
+            self.go_back_to_menu()
+            return
+        self.print_saves(saves)
+        choice: int = self.choose_save(saves)
+        if choice == 0:
+            return
+        self.save_name = saves[choice - 1]["name"]
+        self.game: MinesweeperMap = savefile.load_game(os.path.join(savefile.SAVES_DIR, self.save_name))
+        if self.game.size > VIEWPORT_SIZE:
+            self.game.set_viewport(VIEWPORT_SIZE, VIEWPORT_SIZE)
+        self.play()
 
     def run(self):
         self.print_welcome()
@@ -244,8 +315,8 @@ class MinesweeperUI:
                     self.play()
                 else:
                     self.export_map()
-            # elif choice is MenuOptions.LOAD:
-            #     self.load_game()
+            elif choice is MenuOptions.LOAD:
+                self.load_game()
             elif choice is MenuOptions.HOWTO:
                 self.print_instructions()
             elif choice is MenuOptions.ABOUT:
@@ -0,0 +1,74 @@
+from array import array
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, NamedTuple
+from .hints import load_numpy
+
+# Tables are only built for callers that look up the same neighbors many
+# times, like the solver; reveal and hints use inline bounds checks, which
+# are as fast and need no table. A table costs 4 bytes per neighbor, about
+# 32 bytes per cell, so boards above this many cells do not get one and
+# callers fall back to bounds checks.
+MAX_TABLE_CELLS: int = 1 << 16
+
+
+class NeighborTable(NamedTuple):
+    # CSR adjacency of a rows x cols board in row-major order: the neighbors
+    # of cell i are indices[offsets[i]:offsets[i + 1]].
+    rows: int
+    cols: int
+    offsets: array
+    indices: array
+
+    def of(self, i: int) -> array:
+        return self.indices[self.offsets[i]:self.offsets[i + 1]]
+
+
+def _row_template(cols: int, above: bool, below: bool) -> List[List[int]]:
+    # Neighbors of each cell of a row, relative to the start of the row.
+    template: List[List[int]] = []
+    y: int
+    for y in range(cols):
+        lo: int = max(0, y - 1)
+        hi: int = min(cols, y + 2)
+        cells: List[int] = []
+        if above:
+            cells.extend(range(lo - cols, hi - cols))
+        cells.extend(c for c in range(lo, hi) if c != y)
+        if below:
+            cells.extend(range(lo + cols, hi + cols))
+        template.append(cells)
+    return template
+
+
+@lru_cache(maxsize = 2)
+def neighbor_table(rows: int, cols: int) -> NeighborTable:
+    if rows * cols > MAX_TABLE_CELLS:
+        raise ValueError("board too large for a neighbor table")
+    numpy = load_numpy()
+    templates = {}
+    counts = array("i")
+    indices = array("i")
+    x: int
+    for x in range(rows):
+        key = (x > 0, x < rows - 1)
+        if key not in templates:
+            template: List[List[int]] = _row_template(cols, *key)
+            templates[key] = ([c for cells in template for c in cells], [len(cells) for cells in template])
+        flat, sizes = templates[key]
+        counts.extend(sizes)
+        if numpy is not None and 0 < x < rows - 1:
+            if x == 1:
+                # Every middle row is the same template shifted by whole rows.
+                bases = numpy.arange(1, rows - 1, dtype = numpy.int32) * cols
+                block = bases[:, None] + numpy.array(flat, dtype = numpy.int32)[None, :]
+                indices.frombytes(block.tobytes())
+        else:
+            indices.extend(map((x * cols).__add__, flat))
+    offsets = array("i", [0])
+    offsets.extend(accumulate(counts))
+    return NeighborTable(rows, cols, offsets, indices)
+
+
+def has_table(rows: int, cols: int) -> bool:
+    return rows * cols <= MAX_TABLE_CELLS
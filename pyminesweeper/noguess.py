@@ -0,0 +1,234 @@
+import random
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+from .board import Board, MINE, REVEALED
+from .hints import compute_hints
+from .minesweepermap import MinesweeperMap, MoveResult
+from .placement import new_seed, number_of_mines, place_mines, safe_cells
+from .reveal import flood_reveal
+from .solver import Solver
+
+# No-guess boards: mines are placed around a safe first click, then the
+# deterministic Solver plays the board from that click. While it gets stuck,
+# one mine next to the revealed area is moved into the untouched interior
+# and the board is solved again; after max_repairs the layout is redrawn.
+MAX_REPAIRS: int = 200
+MAX_ATTEMPTS: int = 20
+
+Key = Tuple[int, int, float]
+
+
+def hint_values(rows: int, cols: int, mines: Set[int]) -> array:
+    values: array = array("b", bytes(rows * cols))
+    i: int
+    for i in mines:
+        values[i] = MINE
+    return compute_hints(values, rows, cols)
+
+
+def solve(rows: int, cols: int, values: array, x: int, y: int) -> Tuple[MinesweeperMap, Solver]:
+    # Plays only deduced moves from the first click at (x, y), on a copy of
+    # values, and returns the game and solver where they stopped.
+    num_mines: int = values.count(MINE)
+    game: MinesweeperMap = MinesweeperMap(rows, 0.5, 0, board = Board(rows, cols, array("b", values)))
+    game.num_mines = num_mines
+    game.remaining = rows * cols - num_mines
+    game.generated = True
+    result: MoveResult = game.apply(("r", x, y))
+    solver: Solver = Solver(game, flag_mines = False)
+    while result.result == 0:
+        move: Optional[Tuple[str, int, int]] = solver.next_move()
+        if move is None:
+            break
+        result = game.apply(move)
+        solver.update(result.changed)
+    return game, solver
+
+
+def repair(game: MinesweeperMap, solver: Solver, mines: Set[int], excluded: Set[int], rng: random.Random) -> bool:
+    # Moves one undeduced mine on the edge of the revealed area to a hidden
+    # cell that touches nothing revealed. False when there is no such move.
+    states = game.board.states
+    edge: Set[int] = set()
+    i: int
+    for i in solver.frontier:
+        j: int
+        for j in solver.neighbors(i):
+            if states[j] != REVEALED:
+                edge.add(j)
+    stuck: List[int] = sorted(j for j in edge if j in mines and j not in solver.mines)
+    if not stuck:
+        return False
+    interior: List[int] = [i for i in range(len(states))
+                           if states[i] != REVEALED and i not in edge and i not in mines and i not in excluded]
+    if not interior:
+        return False
+    mines.remove(rng.choice(stuck))
+    mines.add(rng.choice(interior))
+    return True
+
+
+def generate_no_guess(rows: int, cols: int, num_mines: int, x: int, y: int, rng: random.Random = None,
+                      seed: int = None, max_attempts: int = MAX_ATTEMPTS, max_repairs: int = MAX_REPAIRS) -> array:
+    # Returns hint values of a board that the Solver clears from (x, y)
+    # without guessing.
+    if rng is None:
+        rng = random.Random(seed)
+    excluded: Set[int] = safe_cells(rows, cols, x, y, True)
+    if rows * cols - len(excluded) < num_mines:
+        excluded = safe_cells(rows, cols, x, y)
+    _: int
+    for _ in range(max_attempts):
+        mines: Set[int] = set(place_mines(rows, cols, num_mines, excluded, rng))
+        for _ in range(max_repairs + 1):
+            values: array = hint_values(rows, cols, mines)
+            game, solver = solve(rows, cols, values, x, y)
+            if game.result == 1:
+                return values
+            if not repair(game, solver, mines, excluded, rng):
+                break
+    raise ValueError("no solvable %dx%d board with %d mines found" % (rows, cols, num_mines))
+
+
+class ReadyBoard(NamedTuple):
+    # A pre-generated no-guess board. It is solvable from any click on a
+    # cell of `opening`, the zero region revealed by its first click.
+    rows: int
+    cols: int
+    density: float
+    seed: int
+    values: bytes
+    opening: FrozenSet[int]
+
+
+def generate_ready(rows: int, cols: int, density: float, seed: int) -> ReadyBoard:
+    # Pool boards open on a random cell so that between them the ready
+    # boards for a key cover more of the first clicks a player might make.
+    rng: random.Random = random.Random(seed)
+    x: int = rng.randrange(rows)
+    y: int = rng.randrange(cols)
+    values: array = generate_no_guess(rows, cols, number_of_mines(rows, cols, density), x, y, rng)
+    changed: array = flood_reveal(Board(rows, cols, array("b", values)), x, y)[2]
+    return ReadyBoard(rows, cols, density, seed, values.tobytes(), frozenset(i for i in changed if values[i] == 0))
+
+
+def symmetries(rows: int, cols: int) -> List[Tuple[bool, bool, bool]]:
+    # (transpose, flip rows, flip columns), identity first. Only a square
+    # board can be transposed onto itself.
+    transposes: Tuple[bool, ...] = (False, True) if rows == cols else (False,)
+    return [(transpose, flip_rows, flip_cols)
+            for transpose in transposes for flip_rows in (False, True) for flip_cols in (False, True)]
+
+
+def source(rows: int, cols: int, symmetry: Tuple[bool, bool, bool], x: int, y: int) -> int:
+    # The cell of a board that lands on (x, y) when the board is turned by
+    # symmetry.
+    transpose, flip_rows, flip_cols = symmetry
+    if flip_rows:
+        x = rows - 1 - x
+    if flip_cols:
+        y = cols - 1 - y
+    if transpose:
+        x, y = y, x
+    return x * cols + y
+
+
+def orient(board: ReadyBoard, x: int, y: int) -> Optional[ReadyBoard]:
+    # board turned by the first of its symmetries that carries a first click
+    # at (x, y) into its opening, or None. Hints only depend on neighbors,
+    # which every symmetry keeps, so the turned board is as solvable.
+    rows: int = board.rows
+    cols: int = board.cols
+    symmetry: Tuple[bool, bool, bool]
+    for symmetry in symmetries(rows, cols):
+        if source(rows, cols, symmetry, x, y) not in board.opening:
+            continue
+        if not any(symmetry):
+            return board
+        cells: List[int] = [source(rows, cols, symmetry, a, b) for a in range(rows) for b in range(cols)]
+        values: bytes = bytes(board.values[i] for i in cells)
+        return board._replace(values = values, opening = frozenset(j for j, i in enumerate(cells) if i in board.opening))
+    return None
+
+
+class BoardPool:
+    # Generates no-guess boards in worker processes ahead of time. Up to
+    # `depth` boards are kept ready (or in flight) for each of the `max_keys`
+    # most recently used (rows, cols, density) keys; older keys are evicted
+    # and their pending work cancelled.
+    def __init__(self, workers: int = None, depth: int = 4, max_keys: int = 4):
+        self.executor: ProcessPoolExecutor = ProcessPoolExecutor(max_workers = workers)
+        self.depth: int = depth
+        self.max_keys: int = max_keys
+        self.lock: threading.RLock = threading.RLock()
+        self.ready: "OrderedDict[Key, List[ReadyBoard]]" = OrderedDict()
+        self.pending: Dict[Key, List[Future]] = {}
+
+    def touch(self, key: Key):
+        if key not in self.ready:
+            self.ready[key] = []
+            self.pending[key] = []
+        self.ready.move_to_end(key)
+        while len(self.ready) > self.max_keys:
+            old, _ = self.ready.popitem(last = False)
+            future: Future
+            for future in self.pending.pop(old):
+                future.cancel()
+
+    def fill(self, key: Key):
+        _: int
+        for _ in range(self.depth - len(self.ready[key]) - len(self.pending[key])):
+            future: Future = self.executor.submit(generate_ready, *key, new_seed())
+            self.pending[key].append(future)
+            future.add_done_callback(self.done)
+
+    def done(self, future: Future):
+        with self.lock:
+            key: Key
+            futures: List[Future]
+            for key, futures in self.pending.items():
+                if future in futures:
+                    futures.remove(future)
+                    if not future.cancelled() and future.exception() is None:
+                        self.ready[key].append(future.result())
+                    return
+
+    def prefetch(self, rows: int, cols: int, density: float):
+        with self.lock:
+            self.touch((rows, cols, density))
+            self.fill((rows, cols, density))
+
+    def take(self, rows: int, cols: int, density: float, x: int, y: int) -> Optional[ReadyBoard]:
+        # A ready board solvable from a first click at (x, y), or None. Never
+        # waits for a worker. Each board covers its opening under all of its
+        # flips and transposes.
+        key: Key = (rows, cols, density)
+        with self.lock:
+            self.touch(key)
+            boards: List[ReadyBoard] = self.ready[key]
+            n: int
+            board: ReadyBoard
+            for n, board in enumerate(boards):
+                oriented: Optional[ReadyBoard] = orient(board, x, y)
+                if oriented is not None:
+                    del boards[n]
+                    self.fill(key)
+                    return oriented
+            self.fill(key)
+        return None
+
+    def ready_count(self, rows: int, cols: int, density: float) -> int:
+        with self.lock:
+            return len(self.ready.get((rows, cols, density), ()))
+
+    def close(self):
+        self.executor.shutdown(wait = True, cancel_futures = True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
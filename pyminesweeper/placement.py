@@ -0,0 +1,51 @@
+import math
+import random
+from typing import Iterable, List, Set
+
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(63)
+
+
+def number_of_mines(rows: int, cols: int, density: float) -> int:
+    if not 0 < density < 1:
+        raise ValueError("density must be between 0 and 1")
+    return min(rows * cols - 1, math.ceil(density * (rows * cols)))
+
+
+def safe_cells(rows: int, cols: int, x: int, y: int, neighborhood: bool = False) -> Set[int]:
+    if not neighborhood:
+        return {x * cols + y}
+    return {i * cols + j
+            for i in range(max(0, x - 1), min(rows, x + 2))
+            for j in range(max(0, y - 1), min(cols, y + 2))}
+
+
+def place_mines(rows: int, cols: int, num_mines: int, excluded: Iterable[int] = (),
+                rng: random.Random = None, seed: int = None) -> List[int]:
+    # Draws num_mines distinct flat indices in a single sample over the cells
+    # that are not excluded, so the cost depends on the mine count only. Past
+    # half the free cells the complement is sampled instead.
+    if rng is None:
+        rng = random.Random(seed)
+    n: int = rows * cols
+    skip: Set[int] = set(excluded)
+    free: int = n - len(skip)
+    if num_mines > free:
+        raise ValueError("cannot place %d mines in %d free cells" % (num_mines, free))
+
+    mines: List[int]
+    if 2 * num_mines <= free:
+        mines = rng.sample(range(free), num_mines)
+    else:
+        clear: Set[int] = set(rng.sample(range(free), free - num_mines))
+        mines = [i for i in range(free) if i not in clear]
+
+    # Samples are ranks in [0, free); excluded cells below `free` are swapped
+    # for the non-excluded cells at or above it.
+    low: List[int] = sorted(e for e in skip if e < free)
+    if low:
+        high: List[int] = [i for i in range(free, n) if i not in skip]
+        remap = dict(zip(low, high))
+        mines = [remap.get(i, i) for i in mines]
+    return mines
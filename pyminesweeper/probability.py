@@ -0,0 +1,294 @@
+from collections import OrderedDict
+from math import comb
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .board import REVEALED
+
+# Result of enumerating one component: for each possible number of mines k
+# in it, the number of valid configurations with k mines and, per variable,
+# how many of those configurations put a mine on it.
+ComponentCounts = Dict[int, Tuple[int, List[int]]]
+Signature = Tuple[Tuple[Tuple[int, ...], int], ...]
+# A component kept between queries: its frontier cells, its variables in
+# sorted order and its counts.
+Part = Tuple[List[int], List[int], ComponentCounts]
+
+
+class ComponentTooLarge(Exception):
+    pass
+
+
+class ProbabilityEngine:
+    # Mine probabilities for the unknown cells of a Solver's game.
+    #
+    # The constraints of the solver's frontier are split into independent
+    # connected components; each component's valid configurations are
+    # enumerated by backtracking and memoized by a canonical signature of its
+    # constraints. Components are combined through the global mine count,
+    # with the unconstrained interior cells weighted binomially.
+    #
+    # Constraints and components are kept between queries. The solver
+    # reports the cells it learns something about through invalidate(), and
+    # a query only rebuilds the constraints next to those cells and re-splits
+    # the components they belong to or join.
+    def __init__(self, solver, cache_size: int = 4096, max_nodes: int = 10000):
+        self.solver = solver
+        self.cache: "OrderedDict[Signature, ComponentCounts]" = OrderedDict()
+        self.cache_size: int = cache_size
+        self.max_nodes: int = max_nodes
+        self.changed: Set[int] = set()
+        self.rows: Dict[int, Tuple[Set[int], int]] = {}
+        self.parts: Dict[int, Part] = {}
+        self.owner: Dict[int, int] = {}
+        self.var_owner: Dict[int, int] = {}
+        self.next_part: int = 0
+
+    def invalidate(self, cells: Iterable[int]):
+        # Cells that were revealed or deduced safe or mines, or are no longer
+        # deduced safe.
+        self.changed.update(cells)
+
+    def constraint(self, i: int) -> Optional[Tuple[Set[int], int]]:
+        unknown, need = self.solver.constraint(i)
+        unknown -= self.solver.safe
+        return (unknown, need) if unknown else None
+
+    def refresh(self):
+        solver = self.solver
+        frontier: Set[int] = solver.frontier
+        rows: Dict[int, Tuple[Set[int], int]] = self.rows
+        states = solver.board.states
+        var_owner: Dict[int, int] = self.var_owner
+        stale: Set[int] = set()
+        c: int
+        for c in self.changed:
+            if c in frontier or c in rows:
+                stale.add(c)
+            # A cell only changes its neighbors' constraints if it was a
+            # variable at the last query or is one now; most revealed cells
+            # were neither.
+            if c in var_owner or (states[c] != REVEALED and c not in solver.safe and c not in solver.mines):
+                j: int
+                for j in solver.neighbors(c):
+                    if j in frontier or j in rows:
+                        stale.add(j)
+        self.changed.clear()
+        if not stale:
+            return
+
+        # Components holding a stale constraint, or sharing a cell with a
+        # rebuilt one, are split again from their remaining constraints.
+        dissolved: Set[int] = set()
+        i: int
+        for i in stale:
+            if i in self.owner:
+                dissolved.add(self.owner[i])
+            rows.pop(i, None)
+            if i in frontier:
+                row: Optional[Tuple[Set[int], int]] = self.constraint(i)
+                if row is not None:
+                    rows[i] = row
+                    dissolved.update(var_owner[v] for v in row[0] if v in var_owner)
+        cells: Set[int] = {i for i in stale if i in rows}
+        p: int
+        for p in dissolved:
+            members, variables, _ = self.parts.pop(p)
+            for i in members:
+                del self.owner[i]
+                if i in rows:
+                    cells.add(i)
+            v: int
+            for v in variables:
+                del var_owner[v]
+
+        group: List[int]
+        for group in self.components(cells):
+            variables, signature = self.signature([rows[i] for i in group])
+            p = self.next_part
+            self.next_part += 1
+            self.parts[p] = (group, variables, self.count(signature))
+            for i in group:
+                self.owner[i] = p
+            for v in variables:
+                var_owner[v] = p
+
+    def components(self, cells: Iterable[int]) -> List[List[int]]:
+        # Groups the frontier cells whose constraints share unknown cells.
+        rows: Dict[int, Tuple[Set[int], int]] = self.rows
+        parent: Dict[int, int] = {}
+
+        def find(v: int) -> int:
+            while parent[v] != v:
+                parent[v] = parent[parent[v]]
+                v = parent[v]
+            return v
+
+        cells = list(cells)
+        i: int
+        for i in cells:
+            first: Optional[int] = None
+            v: int
+            for v in rows[i][0]:
+                parent.setdefault(v, v)
+                if first is None:
+                    first = find(v)
+                else:
+                    root: int = find(v)
+                    if root != first:
+                        parent[root] = first
+        groups: Dict[int, List[int]] = {}
+        for i in cells:
+            groups.setdefault(find(next(iter(rows[i][0]))), []).append(i)
+        return list(groups.values())
+
+    def signature(self, component: List[Tuple[Set[int], int]]) -> Tuple[List[int], Signature]:
+        variables: List[int] = sorted(set().union(*(unknown for unknown, _ in component)))
+        local: Dict[int, int] = {v: k for k, v in enumerate(variables)}
+        signature: Signature = tuple(sorted(set((tuple(sorted(local[v] for v in unknown)), need)
+                                                for unknown, need in component)))
+        return variables, signature
+
+    def count(self, signature: Signature) -> ComponentCounts:
+        counts: Optional[ComponentCounts] = self.cache.get(signature)
+        if counts is not None:
+            self.cache.move_to_end(signature)
+            return counts
+        counts = self.enumerate(signature)
+        self.cache[signature] = counts
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last = False)
+        return counts
+
+    def enumerate(self, signature: Signature) -> ComponentCounts:
+        num_vars: int = 1 + max(v for variables, _ in signature for v in variables)
+        needs: List[int] = [need for _, need in signature]
+        open_vars: List[int] = [len(variables) for variables, _ in signature]
+        touching: List[List[int]] = [[] for _ in range(num_vars)]
+        c: int
+        for c, (variables, _) in enumerate(signature):
+            for v in variables:
+                touching[v].append(c)
+
+        # Assign variables constraint by constraint so failures show early.
+        order: List[int] = []
+        seen: Set[int] = set()
+        for variables, _ in signature:
+            for v in variables:
+                if v not in seen:
+                    seen.add(v)
+                    order.append(v)
+
+        counts: ComponentCounts = {}
+        assignment: List[int] = [0] * num_vars
+        nodes: List[int] = [0]
+
+        def search(depth: int, mines: int):
+            nodes[0] += 1
+            if nodes[0] > self.max_nodes:
+                raise ComponentTooLarge()
+            if depth == num_vars:
+                total, per_var = counts.setdefault(mines, (0, [0] * num_vars))
+                counts[mines] = (total + 1, [a + b for a, b in zip(per_var, assignment)])
+                return
+            v: int = order[depth]
+            value: int
+            for value in (0, 1):
+                ok: bool = True
+                for c in touching[v]:
+                    needs[c] -= value
+                    open_vars[c] -= 1
+                    if needs[c] < 0 or needs[c] > open_vars[c]:
+                        ok = False
+                assignment[v] = value
+                if ok:
+                    search(depth + 1, mines + value)
+                for c in touching[v]:
+                    needs[c] += value
+                    open_vars[c] += 1
+            assignment[v] = 0
+
+        try:
+            search(0, 0)
+        except ComponentTooLarge:
+            return self.estimate(signature, num_vars)
+        return counts
+
+    def estimate(self, signature: Signature, num_vars: int) -> ComponentCounts:
+        # Fallback for components too large to enumerate: each variable gets
+        # the mean local density of its constraints, as if in one
+        # configuration carrying the rounded expected mine count.
+        share: List[List[float]] = [[] for _ in range(num_vars)]
+        for variables, need in signature:
+            for v in variables:
+                share[v].append(need / len(variables))
+        density: List[float] = [sum(s) / len(s) for s in share]
+        mines: int = round(sum(density))
+        scale: int = 1 << 20
+        return {mines: (scale, [int(d * scale) for d in density])}
+
+    def probabilities(self) -> Tuple[Dict[int, float], float]:
+        # Returns the mine probability of every constrained unknown cell and
+        # the probability shared by every unconstrained (interior) cell.
+        solver = self.solver
+        game = solver.game
+        self.refresh()
+        parts: List[Tuple[List[int], ComponentCounts]] = [(variables, counts)
+                                                          for _, variables, counts in self.parts.values()]
+        constrained: int = len(self.var_owner)
+
+        known_mines: int = len(solver.mines)
+        hidden_mines: int = known_mines - solver.revealed_mines
+        hidden: int = game.remaining + game.num_mines - solver.revealed_mines
+        interior: int = hidden - hidden_mines - len(solver.safe) - constrained
+        left: int = game.num_mines - known_mines
+
+        def weight(mines: int) -> int:
+            rest: int = left - mines
+            return comb(interior, rest) if 0 <= rest <= interior else 0
+
+        polys: List[Dict[int, int]] = [{k: total for k, (total, _) in counts.items()} for _, counts in parts]
+        everything: Dict[int, int] = convolve_all(polys)
+        norm: int = sum(w * weight(k) for k, w in everything.items())
+        if norm == 0:
+            return {}, (left / interior if interior else 0.0)
+
+        probabilities: Dict[int, float] = {}
+        p: int
+        for p, (variables, counts) in enumerate(parts):
+            others: Dict[int, int] = convolve_all(polys[:p] + polys[p + 1:])
+            mine_weight: List[int] = [0] * len(variables)
+            for k, (_, per_var) in counts.items():
+                w: int = sum(o * weight(k + m) for m, o in others.items())
+                if w:
+                    for v, n in enumerate(per_var):
+                        mine_weight[v] += n * w
+            for v, cell in enumerate(variables):
+                probabilities[cell] = mine_weight[v] / norm
+
+        interior_probability: float = 0.0
+        if interior:
+            interior_probability = sum(w * weight(k) * (left - k) for k, w in everything.items()) / (norm * interior)
+        return probabilities, interior_probability
+
+    def best_guess(self) -> Optional[int]:
+        probabilities, interior_probability = self.probabilities()
+        best: Optional[int] = None
+        best_probability: float = 2.0
+        for cell in sorted(probabilities):
+            if probabilities[cell] < best_probability:
+                best, best_probability = cell, probabilities[cell]
+        if interior_probability < best_probability:
+            cell: Optional[int] = self.solver.interior_cell(probabilities)
+            if cell is not None:
+                return cell
+        return best
+
+
+def convolve_all(polys: List[Dict[int, int]]) -> Dict[int, int]:
+    result: Dict[int, int] = {0: 1}
+    for poly in polys:
+        product: Dict[int, int] = {}
+        for a, x in result.items():
+            for b, y in poly.items():
+                product[a + b] = product.get(a + b, 0) + x * y
+        result = product
+    return result
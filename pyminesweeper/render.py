@@ -0,0 +1,68 @@
+from typing import Callable, Iterable, Iterator, List, Optional
+from .board import Board
+
+
+class BoardRenderer:
+    # Caches the play string of every visible row and rebuilds only the rows
+    # invalidated since the last render. The visible window starts at
+    # (top, left) and is at most view_rows x view_cols cells.
+    def __init__(self, board: Board, view_rows: int = None, view_cols: int = None):
+        self.board: Board = board
+        self.top: int = 0
+        self.left: int = 0
+        self.view_rows: int = board.rows if view_rows is None else min(view_rows, board.rows)
+        self.view_cols: int = board.cols if view_cols is None else min(view_cols, board.cols)
+        self.cache: List[Optional[str]] = [None] * self.view_rows
+
+    def is_partial(self) -> bool:
+        return self.view_rows < self.board.rows or self.view_cols < self.board.cols
+
+    def resize(self, view_rows: int, view_cols: int):
+        self.view_rows = min(view_rows, self.board.rows)
+        self.view_cols = min(view_cols, self.board.cols)
+        self.scroll_to(self.top, self.left, force = True)
+
+    def scroll_to(self, top: int, left: int, force: bool = False):
+        top = max(0, min(top, self.board.rows - self.view_rows))
+        left = max(0, min(left, self.board.cols - self.view_cols))
+        if force or top != self.top or left != self.left:
+            self.top = top
+            self.left = left
+            self.invalidate_all()
+
+    def invalidate_all(self):
+        self.cache = [None] * self.view_rows
+
+    def invalidate_row(self, x: int):
+        if self.top <= x < self.top + self.view_rows:
+            self.cache[x - self.top] = None
+
+    def invalidate(self, indices: Iterable[int]):
+        cols: int = self.board.cols
+        x: int
+        for x in {i // cols for i in indices}:
+            self.invalidate_row(x)
+
+    def rows(self) -> Iterator[str]:
+        cache: List[Optional[str]] = self.cache
+        board: Board = self.board
+        stop: int = self.left + self.view_cols
+        r: int
+        for r in range(self.view_rows):
+            row: Optional[str] = cache[r]
+            if row is None:
+                row = cache[r] = board.play_row_str(self.top + r, self.left, stop)
+            yield row
+
+    def render(self) -> str:
+        return "".join(self.rows())
+
+    def write(self, write: Callable[[str], object]):
+        row: str
+        for row in self.rows():
+            write(row)
+
+    def viewport_str(self) -> str:
+        return "Showing rows %d-%d of %d, columns %d-%d of %d" % (
+            self.top + 1, self.top + self.view_rows, self.board.rows,
+            self.left + 1, self.left + self.view_cols, self.board.cols)
@@ -0,0 +1,272 @@
+import bisect
+import struct
+from array import array
+from typing import BinaryIO, List, NamedTuple, Optional
+from .board import Board, MINE, HIDDEN, REVEALED, FLAGGED
+from .hints import load_numpy
+from .minesweepermap import MinesweeperMap, REVEAL, FLAG, CHORD, OPS
+from .noguess import ReadyBoard, generate_ready, orient
+from .reveal import flood_reveal
+
+# Move logs: a fixed header, then one unsigned LEB128 varint per move holding
+# (flat cell index << 2) | op. A board dealt from a no-guess pool is logged as
+# a DEAL record followed by a varint of the pool seed, just before the reveal
+# that generated it. Records are only ever appended, and a log cut short
+# mid-record replays up to the last complete move.
+LOG_MAGIC: bytes = b"PMRL"
+LOG_VERSION: int = 1
+LOG_HEADER = struct.Struct("<4sHIIqdB")
+DEAL: int = 3
+SAFE_NEIGHBORHOOD: int = 1
+NO_GUESS: int = 2
+# Snapshots are taken at least every SNAPSHOT_INTERVAL moves and at most
+# once per cells // SNAPSHOT_RATIO moves, so copying the states costs a few
+# bytes per move on any board size.
+SNAPSHOT_INTERVAL: int = 4096
+SNAPSHOT_RATIO: int = 16
+
+
+def varint(value: int) -> bytes:
+    out: bytearray = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data) -> array:
+    if load_numpy() is not None:
+        return _decode_varints_numpy(data)
+    values: array = array("q")
+    append = values.append
+    value: int = 0
+    shift: int = 0
+    byte: int
+    for byte in data:
+        if byte & 0x80:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        else:
+            append(value | byte << shift)
+            value = 0
+            shift = 0
+    return values
+
+
+def _decode_varints_numpy(data) -> array:
+    numpy = load_numpy()
+    raw = numpy.frombuffer(data, dtype = numpy.uint8)
+    ends = numpy.flatnonzero(raw < 0x80)
+    if not len(ends):
+        return array("q")
+    raw = raw[:ends[-1] + 1]
+    starts = numpy.concatenate(([0], ends[:-1] + 1))
+    shifts = 7 * (numpy.arange(len(raw)) - numpy.repeat(starts, ends - starts + 1))
+    values = numpy.add.reduceat((raw & 0x7F).astype(numpy.int64) << shifts, starts)
+    return array("q", values.tobytes())
+
+
+class MoveLog:
+    # Appends every move applied to game to fil. Attach it to a game before
+    # its first move; the header pins everything needed to rebuild the board.
+    def __init__(self, fil: BinaryIO, game: MinesweeperMap):
+        if game.generated or game.turns:
+            raise ValueError("only a new game can be recorded")
+        self.fil: BinaryIO = fil
+        self.game: MinesweeperMap = game
+        self.dealt: bool = False
+        flags: int = (SAFE_NEIGHBORHOOD if game.safe_neighborhood else 0) | (NO_GUESS if game.no_guess else 0)
+        fil.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, game.rows, game.cols, game.seed, game.density, flags))
+        game.recorder = self
+
+    def record(self, m: str, x: int, y: int):
+        game: MinesweeperMap = self.game
+        if game.pooled and not self.dealt:
+            self.fil.write(varint(DEAL) + varint(game.seed))
+            self.dealt = True
+        self.fil.write(varint((x * game.cols + y) << 2 | OPS[m]))
+
+    def flush(self):
+        self.fil.flush()
+
+    def close(self):
+        if self.game.recorder is self:
+            self.game.recorder = None
+        self.fil.close()
+
+
+def record(game: MinesweeperMap, path: str) -> MoveLog:
+    return MoveLog(open(path, "wb"), game)
+
+
+class Snapshot(NamedTuple):
+    turn: int
+    generated: bool
+    states: bytes
+    lives: int
+    turns: int
+    flags: int
+    remaining: int
+    result: int
+
+
+class Replay:
+    # Rebuilds a logged game without rendering. Moves are decoded once into
+    # an array; advancing applies them straight to the board buffers, and a
+    # snapshot of the cell states is kept every `interval` moves so seek()
+    # only replays from the nearest snapshot at or before a turn.
+    def __init__(self, data: bytes, interval: int = None):
+        magic, version, rows, cols, seed, density, flags = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC:
+            raise ValueError("not a minesweeper move log")
+        if version != LOG_VERSION:
+            raise ValueError("unsupported move log version " + str(version))
+        self.interval: int = interval or max(SNAPSHOT_INTERVAL, rows * cols // SNAPSHOT_RATIO)
+        self.density: float = density
+        self.dealt: Optional[int] = None
+        # The generated board, kept to restore snapshots taken after it.
+        self.values: Optional[bytes] = None
+        records: array = decode_varints(memoryview(data)[LOG_HEADER.size:])
+        if DEAL in records:
+            at: int = records.index(DEAL)
+            self.dealt = records[at + 1]
+            del records[at:at + 2]
+        self.moves: array = records
+        self.game: MinesweeperMap = MinesweeperMap(rows, density, seed, bool(flags & SAFE_NEIGHBORHOOD), cols = cols,
+                                                   no_guess = bool(flags & NO_GUESS))
+        self.turn: int = 0
+        self.snapshots: List[Snapshot] = []
+        self.snapshot()
+
+    @classmethod
+    def open(cls, path: str, interval: int = None) -> "Replay":
+        with open(path, "rb") as fil:
+            return cls(fil.read(), interval)
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def snapshot(self):
+        game: MinesweeperMap = self.game
+        self.snapshots.append(Snapshot(self.turn, game.generated, bytes(game.board.states), game.lives,
+                                       game.turns, game.flags, game.remaining, game.result))
+
+    def restore(self, snap: Snapshot):
+        game: MinesweeperMap = self.game
+        board: Board = game.board
+        board.states[:] = snap.states
+        if not snap.generated:
+            board.values[:] = array("b", bytes(len(board)))
+        elif not game.generated:
+            board.values[:] = array("b", self.values)
+        game.generated = snap.generated
+        game.lives = snap.lives
+        game.turns = snap.turns
+        game.flags = snap.flags
+        game.remaining = snap.remaining
+        game.result = snap.result
+        self.turn = snap.turn
+
+    def generate(self, i: int):
+        game: MinesweeperMap = self.game
+        if self.dealt is not None:
+            # The pool turned the board to fit the first click; turn it again.
+            ready: ReadyBoard = orient(generate_ready(game.rows, game.cols, self.density, self.dealt), *game.board.position(i))
+            game.board.values[:] = array("b", ready.values)
+            game.seed = self.dealt
+            game.generated = True
+        else:
+            game.generate_map(*game.board.position(i))
+        self.values = game.board.values.tobytes()
+
+    def advance(self, stop: int):
+        # Applies moves [self.turn, stop) with the rules of
+        # MinesweeperMap.apply, keeping the counters in locals.
+        game: MinesweeperMap = self.game
+        board: Board = game.board
+        states = board.states
+        values = board.values
+        cols: int = board.cols
+        moves: array = self.moves
+        interval: int = self.interval
+        next_snapshot: int = (self.turn // interval + 1) * interval
+        lives: int = game.lives
+        turns: int = game.turns
+        flags: int = game.flags
+        remaining: int = game.remaining
+        result: int = game.result
+        generated: bool = game.generated
+        turn: int
+        for turn in range(self.turn, stop):
+            code: int = moves[turn]
+            i: int = code >> 2
+            op: int = code & 3
+            if op == REVEAL:
+                if not generated:
+                    self.generate(i)
+                    generated = True
+                val: int = values[i]
+                if states[i] == HIDDEN and val > 0:
+                    states[i] = REVEALED
+                    remaining -= 1
+                    hit: bool = True
+                else:
+                    revealed: int
+                    cleared: int
+                    val, revealed, changed, cleared = flood_reveal(board, i // cols, i % cols)
+                    flags -= cleared
+                    if val != MINE:
+                        remaining -= revealed
+                    hit = len(changed) > 0
+                if val == MINE and hit:
+                    if lives > 0:
+                        lives -= 1
+                    else:
+                        result = -1
+                elif remaining == 0:
+                    result = 1
+                turns += 1
+            elif op == FLAG:
+                state: int = states[i]
+                if state == FLAGGED:
+                    states[i] = HIDDEN
+                    flags -= 1
+                elif state != REVEALED:
+                    states[i] = FLAGGED
+                    flags += 1
+                if generated:
+                    turns += 1
+            elif op == CHORD:
+                # Rare enough to go through the game itself.
+                game.lives, game.turns, game.flags, game.remaining, game.result = lives, turns, flags, remaining, result
+                game.apply_batch(moves[turn:turn + 1])
+                lives, turns, flags, remaining, result = game.lives, game.turns, game.flags, game.remaining, game.result
+            else:
+                raise ValueError("unknown move log op %d at move %d" % (op, turn))
+            if turn + 1 == next_snapshot:
+                game.lives, game.turns, game.flags, game.remaining, game.result = lives, turns, flags, remaining, result
+                self.turn = turn + 1
+                if self.snapshots[-1].turn < self.turn:
+                    self.snapshot()
+                next_snapshot += interval
+        game.lives, game.turns, game.flags, game.remaining, game.result = lives, turns, flags, remaining, result
+        self.turn = stop
+
+    def seek(self, turn: int) -> MinesweeperMap:
+        # The game as it stood after `turn` moves.
+        turn = max(0, min(turn, len(self.moves)))
+        snap: Snapshot = self.snapshots[bisect.bisect_right([s.turn for s in self.snapshots], turn) - 1]
+        if turn < self.turn or snap.turn > self.turn:
+            self.restore(snap)
+        self.advance(turn)
+        self.game.renderer.invalidate_all()
+        return self.game
+
+    def run(self) -> MinesweeperMap:
+        return self.seek(len(self.moves))
+
+
+def replay(path: str, turn: int = None) -> MinesweeperMap:
+    log: Replay = Replay.open(path)
+    return log.run() if turn is None else log.seek(turn)
@@ -0,0 +1,94 @@
+from array import array
+from typing import List, Sequence, Tuple
+from .board import Board, HIDDEN, REVEALED, FLAGGED
+
+
+def flood_reveal(board: Board, x: int, y: int) -> Tuple[int, int, array, int]:
+    # Reveals (x, y) and, if it is a 0, the whole connected opening around it
+    # using an explicit stack instead of recursion. A cell is marked revealed
+    # when it is pushed, so the state buffer doubles as the visited bitmap.
+    # Returns the cell value, the number of cells revealed, their flat indices
+    # and how many flags were cleared on the way.
+    states = board.states
+    values = board.values
+    cols: int = board.cols
+    start: int = x * cols + y
+    changed: array = board.index_array()
+    if states[start] == REVEALED:
+        return values[start], 0, changed, 0
+
+    flags_cleared: int = 1 if states[start] == FLAGGED else 0
+    states[start] = REVEALED
+    changed.append(start)
+    if values[start] != 0:
+        return values[start], 1, changed, flags_cleared
+
+    flags_cleared += flood_from(board, [start], changed)
+    return 0, len(changed), changed, flags_cleared
+
+
+def flood_from(board: Board, stack: List[int], changed: array) -> int:
+    # Drains a flood fill: stack holds revealed 0 cells whose neighbors still
+    # have to be revealed. Newly revealed cells are appended to changed, and
+    # the stack is left empty. Several openings can be seeded at once; each
+    # cell is still revealed only once. Returns how many flags were cleared.
+    states = board.states
+    values = board.values
+    rows: int = board.rows
+    cols: int = board.cols
+    flags_cleared: int = 0
+    last_row: int = (rows - 1) * cols
+    last_col: int = cols - 1
+    pop = stack.pop
+    push = stack.append
+    record = changed.append
+    while stack:
+        i: int = pop()
+        col: int = i % cols
+        if 0 < col < last_col and cols <= i < last_row:
+            neighbors = (i - cols - 1, i - cols, i - cols + 1, i - 1, i + 1, i + cols - 1, i + cols, i + cols + 1)
+        else:
+            lo: int = i - 1 if col > 0 else i
+            hi: int = i + 2 if col < last_col else i + 1
+            neighbors = list(range(lo, hi))
+            if i >= cols:
+                neighbors += range(lo - cols, hi - cols)
+            if i < last_row:
+                neighbors += range(lo + cols, hi + cols)
+        j: int
+        for j in neighbors:
+            state: int = states[j]
+            if state != REVEALED:
+                if state == FLAGGED:
+                    flags_cleared += 1
+                states[j] = REVEALED
+                record(j)
+                if values[j] == 0:
+                    push(j)
+    return flags_cleared
+
+
+def cell_neighbors(rows: int, cols: int, i: int) -> Sequence[int]:
+    x, y = divmod(i, cols)
+    return [a * cols + b for a in range(max(0, x - 1), min(rows, x + 2))
+            for b in range(max(0, y - 1), min(cols, y + 2)) if a != x or b != y]
+
+
+def chord_cells(board: Board, i: int) -> List[int]:
+    # The cells a chord on i reveals: every hidden, unflagged neighbor when i
+    # is a revealed number with exactly that many flagged neighbors, and
+    # none otherwise.
+    states = board.states
+    value: int = board.values[i]
+    if states[i] != REVEALED or value <= 0:
+        return []
+    flagged: int = 0
+    hidden: List[int] = []
+    j: int
+    for j in cell_neighbors(board.rows, board.cols, i):
+        state: int = states[j]
+        if state == FLAGGED:
+            flagged += 1
+        elif state == HIDDEN:
+            hidden.append(j)
+    return hidden if flagged == value else []
@@ -0,0 +1,97 @@
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, List
+from .board import Board
+from .minesweepermap import MinesweeperMap
+
+# Save files: a fixed header followed by the raw value bytes (one signed
+# byte per cell) and the raw state bytes (one byte per cell), row-major.
+SAVE_MAGIC: bytes = b"PMSV"
+SAVE_VERSION: int = 3
+SAVE_HEADER = struct.Struct("<4sHIIIiIiIqdBBBb")
+SAVES_DIR: str = "saves"
+INDEX_NAME: str = "index.jsonl"
+
+
+def save_game(game: MinesweeperMap, path: str):
+    board: Board = game.board
+    with open(path, "wb") as fil:
+        fil.write(SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, board.rows, board.cols, game.num_mines, game.lives,
+                                   game.turns, game.flags, game.remaining, game.seed, game.density,
+                                   game.generated, game.safe_neighborhood, game.no_guess, game.result))
+        fil.write(board.values)
+        fil.write(board.states)
+
+
+def load_game(path: str) -> MinesweeperMap:
+    # The file is mapped copy-on-write and the board reads straight from the
+    # mapping, so opening a save does not read the cells up front.
+    with open(path, "rb") as fil:
+        data = mmap.mmap(fil.fileno(), 0, access = mmap.ACCESS_COPY)
+    if len(data) < SAVE_HEADER.size:
+        raise ValueError(path + " is truncated")
+    (magic, version, rows, cols, num_mines, lives, turns, flags, remaining, seed, density,
+     generated, safe_neighborhood, no_guess, result) = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError(path + " is not a minesweeper save")
+    if version != SAVE_VERSION:
+        raise ValueError("unsupported save version " + str(version))
+    cells: int = rows * cols
+    if len(data) < SAVE_HEADER.size + 2 * cells:
+        raise ValueError(path + " is truncated")
+
+    view = memoryview(data)
+    start: int = SAVE_HEADER.size
+    board: Board = Board(rows, cols, view[start:start + cells].cast("b"), view[start + cells:start + 2 * cells])
+    game: MinesweeperMap = MinesweeperMap(rows, density, seed, bool(safe_neighborhood), board = board,
+                                          no_guess = bool(no_guess))
+    game.num_mines = num_mines
+    game.lives = lives
+    game.turns = turns
+    game.flags = flags
+    game.remaining = remaining
+    game.generated = bool(generated)
+    game.result = result
+    return game
+
+
+def save_to_directory(game: MinesweeperMap, directory: str = SAVES_DIR, name: str = None) -> str:
+    # A new save gets a fresh name. Given the name of an existing save, that
+    # save is replaced and its index entry superseded; the new file is
+    # written beside it and renamed over it, since a game loaded from the old
+    # one may still be reading its cells from the mapping.
+    os.makedirs(directory, exist_ok = True)
+    stamp: int = int(round(time.time() * 1000))
+    if name is None:
+        name = str(stamp) + ".save"
+        while os.path.exists(os.path.join(directory, name)):
+            stamp += 1
+            name = str(stamp) + ".save"
+    path: str = os.path.join(directory, name)
+    save_game(game, path + ".tmp")
+    os.replace(path + ".tmp", path)
+    entry: Dict = {"name": name, "time": stamp, "size": game.rows, "cols": game.cols, "turns": game.turns,
+                   "lives": game.lives, "flags": game.flags}
+    with open(os.path.join(directory, INDEX_NAME), "a") as index:
+        index.write(json.dumps(entry) + "\n")
+    return path
+
+
+def list_saves(directory: str = SAVES_DIR) -> List[Dict]:
+    # Reads the index only; the last entry of each save wins, and entries
+    # whose save file is gone are skipped.
+    saves: Dict[str, Dict] = {}
+    try:
+        index = open(os.path.join(directory, INDEX_NAME))
+    except FileNotFoundError:
+        return []
+    with index:
+        line: str
+        for line in index:
+            if line.strip():
+                entry: Dict = json.loads(line)
+                saves[entry["name"]] = entry
+    return [entry for name, entry in saves.items() if os.path.exists(os.path.join(directory, name))]
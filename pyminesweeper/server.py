@@ -0,0 +1,147 @@
+import asyncio
+from typing import List, Optional
+from .board import MINE, REVEALED, FLAGGED, Board
+from .minesweepermap import MinesweeperMap, MoveResult
+
+# Line protocol, one session per connection:
+#
+#   client                     server
+#   new SIZE [DENSITY [SEED]]  ok ROWS COLS MINES LIVES
+#   r|f|c|v X Y                m RESULT LIVES REMAINING [INDEX:CELL ...]
+#   q                          bye
+#                              e MESSAGE (bad input, idle or busy)
+#
+# Moves use the validate_move syntax with 1-based coordinates. A move answer
+# only lists the cells it changed, by 0-based row-major index: CELL is the
+# revealed value (X for a mine), F for a flag or H for an unflagged cell.
+# RESULT is 1 once won, -1 once lost and 0 otherwise.
+DEFAULT_DENSITY: float = 0.15
+MAX_SIZE: int = 1000
+MAX_LINE: int = 1024
+IDLE_TIMEOUT: float = 300.0
+MAX_SESSIONS: int = 10000
+WRITE_HIGH_WATER: int = 1 << 16
+
+
+def cell_str(board: Board, i: int) -> str:
+    state: int = board.states[i]
+    if state == REVEALED:
+        value: int = board.values[i]
+        return "X" if value == MINE else str(value)
+    return "F" if state == FLAGGED else "H"
+
+
+def delta_str(game: MinesweeperMap, move: MoveResult) -> str:
+    board: Board = game.board
+    parts: List[str] = ["m", str(move.result), str(game.lives), str(game.remaining)]
+    parts.extend(str(i) + ":" + cell_str(board, i) for i in move.changed)
+    return " ".join(parts) + "\n"
+
+
+def new_game(args: List[str]) -> MinesweeperMap:
+    if not 1 <= len(args) <= 3:
+        raise ValueError("usage: new SIZE [DENSITY [SEED]]")
+    size: int = int(args[0])
+    if not 3 <= size <= MAX_SIZE:
+        raise ValueError("size must be between 3 and " + str(MAX_SIZE))
+    density: float = float(args[1]) if len(args) > 1 else DEFAULT_DENSITY
+    seed: Optional[int] = int(args[2]) if len(args) > 2 else None
+    return MinesweeperMap(size, density, seed)
+
+
+class GameServer:
+    # Serves one MinesweeperMap per connection. A session that sends nothing
+    # for idle_timeout seconds is closed. Answers are only written once the
+    # previous ones have drained below the transport's high-water mark, so a
+    # client that stops reading stops being read from.
+    def __init__(self, idle_timeout: float = IDLE_TIMEOUT, max_sessions: int = MAX_SESSIONS):
+        self.idle_timeout: float = idle_timeout
+        self.max_sessions: int = max_sessions
+        self.active: int = 0
+        self.sessions: int = 0
+        self.moves: int = 0
+        self.evicted: int = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.transport.set_write_buffer_limits(high = WRITE_HIGH_WATER)
+        if self.active >= self.max_sessions:
+            writer.write(b"e busy\n")
+            await self.close(writer)
+            return
+        self.active += 1
+        self.sessions += 1
+        try:
+            await self.session(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active -= 1
+            await self.close(writer)
+
+    async def session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        game: Optional[MinesweeperMap] = None
+        while True:
+            try:
+                line: bytes = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                self.evicted += 1
+                writer.write(b"e idle\n")
+                return
+            except ValueError:
+                writer.write(b"e line too long\n")
+                return
+            if not line:
+                return
+            text: str = line.decode("utf-8", "replace").strip()
+            if not text:
+                continue
+            answer: str = ""
+            words: List[str] = text.split()
+            if words[0] == "q":
+                writer.write(b"bye\n")
+                return
+            if words[0] == "new":
+                try:
+                    game = new_game(words[1:])
+                    answer = "ok %d %d %d %d\n" % (game.rows, game.cols, game.num_mines, game.lives)
+                except ValueError as err:
+                    answer = "e " + str(err) + "\n"
+            elif game is None:
+                answer = "e no game, send new SIZE first\n"
+            else:
+                try:
+                    answer = delta_str(game, game.apply(text))
+                    self.moves += 1
+                except ValueError as err:
+                    answer = "e " + str(err) + "\n"
+            writer.write(answer.encode())
+            await writer.drain()
+
+    async def close(self, writer: asyncio.StreamWriter):
+        try:
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, path: str = None) -> asyncio.AbstractServer:
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle, path, limit = MAX_LINE, backlog = 1024)
+        else:
+            self.server = await asyncio.start_server(self.handle, host, port, limit = MAX_LINE, backlog = 1024)
+        return self.server
+
+    def stats_str(self) -> str:
+        return "%d active, %d sessions, %d moves, %d evicted" % (self.active, self.sessions, self.moves,
+                                                                 self.evicted)
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8765, path: str = None, idle_timeout: float = IDLE_TIMEOUT,
+                max_sessions: int = MAX_SESSIONS, log = None):
+    game_server: GameServer = GameServer(idle_timeout, max_sessions)
+    server: asyncio.AbstractServer = await game_server.start(host, port, path)
+    if log is not None:
+        log("serving on " + ", ".join(str(sock.getsockname()) for sock in server.sockets))
+    async with server:
+        await server.serve_forever()
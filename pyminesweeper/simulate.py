@@ -0,0 +1,116 @@
+import csv
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from .board import REVEALED, FLAGGED
+from .minesweepermap import MinesweeperMap, MoveResult
+
+# An agent is called once per game with the fresh MinesweeperMap and returns
+# a policy. The policy is called with the MoveResult of its previous move
+# (None before the first move) and returns the next (mode, x, y) move, or
+# None to give up. Agents must be importable module-level callables so they
+# can be sent to worker processes.
+Move = Tuple[str, int, int]
+Policy = Callable[[Optional[MoveResult]], Optional[Move]]
+Agent = Callable[[MinesweeperMap], Policy]
+
+RESULT_FIELDS: List[str] = ["seed", "size", "density", "result", "turns", "lives_used", "wall_time"]
+RESULT_NAMES: Dict[int, str] = {1: "win", -1: "loss", 0: "unfinished"}
+
+
+def random_agent(game: MinesweeperMap) -> Policy:
+    # Opens in the center, then reveals uniformly random unrevealed cells.
+    rng: random.Random = random.Random(game.seed)
+
+    def policy(last: Optional[MoveResult]) -> Optional[Move]:
+        if last is None:
+            return "r", game.board.rows // 2, game.board.cols // 2
+        states = game.board.states
+        hidden: List[int] = [i for i in range(len(states)) if states[i] != REVEALED and states[i] != FLAGGED]
+        if not hidden:
+            return None
+        x, y = game.board.position(rng.choice(hidden))
+        return "r", x, y
+
+    return policy
+
+
+def load_agent(spec: str) -> Agent:
+    module_name, _, name = spec.partition(":")
+    if not name:
+        raise ValueError("agent must be given as module:callable, got " + spec)
+    return getattr(importlib.import_module(module_name), name)
+
+
+def play_game(size: int, density: float, seed: int, agent: Agent, max_moves: int = None) -> Dict:
+    start: float = time.perf_counter()
+    game: MinesweeperMap = MinesweeperMap(size, density, seed)
+    lives: int = game.lives
+    policy: Policy = agent(game)
+    limit: int = max_moves if max_moves is not None else 4 * size * size
+    last: Optional[MoveResult] = None
+    moves: int = 0
+    while moves < limit:
+        move: Optional[Move] = policy(last)
+        if move is None or move[0] == "q":
+            break
+        last = game.apply(move)
+        moves += 1
+        if last.result != 0:
+            break
+    return {"seed": seed, "size": size, "density": density, "result": RESULT_NAMES[game.result],
+            "turns": game.turns, "lives_used": lives - game.lives, "wall_time": time.perf_counter() - start}
+
+
+def play_games(size: int, density: float, seeds: Iterable[int], agent: Agent, max_moves: int = None) -> List[Dict]:
+    return [play_game(size, density, seed, agent, max_moves) for seed in seeds]
+
+
+def chunk_seeds(seeds: range, chunksize: int) -> Iterator[range]:
+    start: int
+    for start in range(0, len(seeds), chunksize):
+        yield seeds[start:start + chunksize]
+
+
+def simulate(size: int, density: float, seeds: range, agent: Agent, workers: int = None,
+             chunksize: int = None, max_moves: int = None) -> Iterator[Dict]:
+    # Yields one result per seed, in seed order. Seeds are handed to worker
+    # processes in contiguous chunks so each task amortizes its dispatch cost.
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, min(256, len(seeds) // (workers * 8)))
+    if workers == 1:
+        chunk: range
+        for chunk in chunk_seeds(seeds, chunksize):
+            yield from play_games(size, density, chunk, agent, max_moves)
+        return
+
+    chunks: List[range] = list(chunk_seeds(seeds, chunksize))
+    with ProcessPoolExecutor(max_workers = workers) as pool:
+        results: List[Dict]
+        for results in pool.map(play_games, [size] * len(chunks), [density] * len(chunks), chunks,
+                                [agent] * len(chunks), [max_moves] * len(chunks)):
+            yield from results
+
+
+class ResultSink:
+    # Writes results as JSON lines or CSV rows as they arrive.
+    def __init__(self, fil: TextIO, fmt: str = "jsonl"):
+        if fmt not in ("jsonl", "csv"):
+            raise ValueError("unknown result format " + fmt)
+        self.fil: TextIO = fil
+        self.fmt: str = fmt
+        self.writer = None
+        if fmt == "csv":
+            self.writer = csv.DictWriter(fil, fieldnames = RESULT_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, result: Dict):
+        if self.writer is not None:
+            self.writer.writerow(result)
+        else:
+            self.fil.write(json.dumps(result) + "\n")
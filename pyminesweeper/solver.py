@@ -0,0 +1,192 @@
+from typing import Iterable, List, Optional, Set, Tuple
+from .board import Board, MINE, REVEALED
+from .minesweepermap import MinesweeperMap, MoveResult
+from .neighbors import NeighborTable, has_table, neighbor_table
+from .probability import ProbabilityEngine
+
+
+class Solver:
+    # Deterministic constraint propagation over a MinesweeperMap.
+    #
+    # The frontier holds the revealed numbered cells that still touch cells
+    # whose contents are unknown. update() is fed the cells changed by each
+    # move and only re-examines frontier cells next to them, applying the
+    # single-cell rule (a number already satisfied, or needing all of its
+    # unknown neighbors) and the pairwise subset rule between nearby
+    # frontier cells. Deduced cells are collected in `safe` and `mines`.
+    def __init__(self, game: MinesweeperMap, flag_mines: bool = True):
+        self.game: MinesweeperMap = game
+        self.board: Board = game.board
+        self.table: Optional[NeighborTable] = None
+        if has_table(self.board.rows, self.board.cols):
+            self.table = neighbor_table(self.board.rows, self.board.cols)
+        self.flag_mines: bool = flag_mines
+        self.frontier: Set[int] = set()
+        self.mines: Set[int] = set()
+        self.safe: Set[int] = set()
+        self.dirty: Set[int] = set()
+        self.to_flag: List[int] = []
+        self.cursor: int = 0
+        self.revealed_mines: int = 0
+        self.engine: ProbabilityEngine = ProbabilityEngine(self)
+        states = self.board.states
+        self.update([i for i in range(len(self.board)) if states[i] == REVEALED])
+
+    def neighbors(self, i: int):
+        table: Optional[NeighborTable] = self.table
+        if table is not None:
+            return table.indices[table.offsets[i]:table.offsets[i + 1]]
+        rows: int = self.board.rows
+        cols: int = self.board.cols
+        x, y = divmod(i, cols)
+        return [a * cols + b
+                for a in range(max(0, x - 1), min(rows, x + 2))
+                for b in range(max(0, y - 1), min(cols, y + 2))
+                if a != x or b != y]
+
+    def nearby(self, i: int) -> List[int]:
+        # Frontier cells close enough to share unknown neighbors with i.
+        cols: int = self.board.cols
+        x, y = divmod(i, cols)
+        frontier: Set[int] = self.frontier
+        return [a * cols + b
+                for a in range(max(0, x - 2), min(self.board.rows, x + 3))
+                for b in range(max(0, y - 2), min(cols, y + 3))
+                if (a != x or b != y) and a * cols + b in frontier]
+
+    def update(self, changed: Iterable[int]):
+        states = self.board.states
+        values = self.board.values
+        i: int
+        for i in changed:
+            if states[i] != REVEALED:
+                continue
+            self.engine.invalidate((i,))
+            self.safe.discard(i)
+            if values[i] == MINE:
+                self.mines.add(i)
+                self.revealed_mines += 1
+            elif values[i] > 0:
+                self.frontier.add(i)
+                self.dirty.add(i)
+            j: int
+            for j in self.neighbors(i):
+                if j in self.frontier:
+                    self.dirty.add(j)
+        self.propagate()
+
+    def constraint(self, i: int) -> Tuple[Set[int], int]:
+        # Unknown neighbors of frontier cell i and how many of them are mines.
+        states = self.board.states
+        mines: Set[int] = self.mines
+        unknown: Set[int] = set()
+        need: int = self.board.values[i]
+        j: int
+        for j in self.neighbors(i):
+            if j in mines:
+                need -= 1
+            elif states[j] != REVEALED:
+                unknown.add(j)
+        return unknown, need
+
+    def mark_mines(self, cells: Iterable[int]):
+        j: int
+        for j in cells:
+            if j not in self.mines:
+                self.mines.add(j)
+                self.to_flag.append(j)
+                self.engine.invalidate((j,))
+                k: int
+                for k in self.neighbors(j):
+                    if k in self.frontier:
+                        self.dirty.add(k)
+
+    def mark_safe(self, cells: Set[int]):
+        self.safe.update(cells)
+        self.engine.invalidate(cells)
+
+    def propagate(self):
+        while self.dirty:
+            i: int = self.dirty.pop()
+            if i not in self.frontier:
+                continue
+            unknown, need = self.constraint(i)
+            if not unknown:
+                self.frontier.discard(i)
+            elif need == 0:
+                self.mark_safe(unknown)
+            elif need == len(unknown):
+                self.mark_mines(unknown)
+            else:
+                self.compare(i, unknown, need)
+
+    def compare(self, i: int, unknown: Set[int], need: int):
+        j: int
+        for j in self.nearby(i):
+            other, other_need = self.constraint(j)
+            if not other:
+                continue
+            if unknown < other:
+                self.subset_rule(unknown, need, other, other_need)
+            elif other < unknown:
+                self.subset_rule(other, other_need, unknown, need)
+            if i in self.dirty:
+                # A mine found above re-queued i; it will be looked at again.
+                return
+
+    def subset_rule(self, small: Set[int], small_need: int, large: Set[int], large_need: int):
+        rest: Set[int] = large - small
+        rest_need: int = large_need - small_need
+        if rest_need == 0:
+            self.mark_safe(rest)
+        elif rest_need == len(rest):
+            self.mark_mines(rest)
+
+    def next_move(self) -> Optional[Tuple[str, int, int]]:
+        states = self.board.states
+        while self.safe:
+            i: int = self.safe.pop()
+            self.engine.invalidate((i,))
+            if states[i] != REVEALED:
+                return ("r",) + self.board.position(i)
+        while self.flag_mines and self.to_flag:
+            i = self.to_flag.pop()
+            if states[i] != REVEALED and not self.game.is_flagged(*self.board.position(i)):
+                return ("f",) + self.board.position(i)
+        return None
+
+    def guess(self) -> Optional[Tuple[str, int, int]]:
+        # The unknown cell least likely to be a mine.
+        i: Optional[int] = self.engine.best_guess()
+        if i is None:
+            i = self.interior_cell(())
+        if i is None:
+            return None
+        return ("r",) + self.board.position(i)
+
+    def interior_cell(self, exclude) -> Optional[int]:
+        # The first unknown cell in row-major order that is not in exclude.
+        # Cells behind the cursor are revealed or known mines for good.
+        states = self.board.states
+        n: int = len(self.board)
+        while self.cursor < n and (states[self.cursor] == REVEALED or self.cursor in self.mines):
+            self.cursor += 1
+        i: int
+        for i in range(self.cursor, n):
+            if states[i] != REVEALED and i not in self.mines and i not in self.safe and i not in exclude:
+                return i
+        return None
+
+
+def solver_agent(game: MinesweeperMap):
+    # Agent for simulate: opens in the center, plays every deduced move and
+    # guesses only when nothing is certain.
+    solver: Solver = Solver(game)
+
+    def policy(last: Optional[MoveResult]) -> Optional[Tuple[str, int, int]]:
+        if last is None:
+            return "r", game.board.rows // 2, game.board.cols // 2
+        solver.update(last.changed)
+        return solver.next_move() or solver.guess()
+
+    return policy
@@ -0,0 +1,24 @@
+from typing import Dict
+
+from pyminesweeper.bench import MIN_REPEAT, compare, run
+
+
+def results(data: Dict) -> Dict:
+    return {(entry["op"], entry["size"], entry["density"]): entry for entry in data["results"]}
+
+
+def test_every_case_is_timed_at_least_min_repeat_times():
+    data: Dict = run([10], [0.15], repeat = 1, memory = False)
+    entry: Dict
+    for entry in data["results"]:
+        assert entry["repeat"] >= MIN_REPEAT
+        assert entry["spread"] >= 0
+
+
+def test_compare_flags_slowdowns_beyond_the_noise_only():
+    old: Dict = {("reveal", 100, 0.15): {"seconds": 0.010, "spread": 0.004, "peak_bytes": None}}
+    noisy: Dict = {("reveal", 100, 0.15): {"seconds": 0.013, "spread": 0.005, "peak_bytes": None}}
+    slower: Dict = {("reveal", 100, 0.15): {"seconds": 0.020, "spread": 0.004, "peak_bytes": None}}
+    assert not compare(old, old)[0]["regression"]
+    assert not compare(old, noisy)[0]["regression"]
+    assert compare(old, slower)[0]["regression"]
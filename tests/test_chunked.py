@@ -0,0 +1,54 @@
+from pyminesweeper.chunked import ChunkedBoard, ChunkedGame
+
+
+def opened(board: ChunkedBoard, rows: int, cols: int):
+    return {(x, y) for x in range(rows) for y in range(cols) if board.is_revealed(x, y)}
+
+
+def test_limited_reveal_stops_at_limit_and_resumes():
+    board: ChunkedBoard = ChunkedBoard(1, 0.02, 16, (50, 50), rows = 200, cols = 200)
+    val, revealed, changed = board.reveal(50, 50, limit = 10)
+    assert val == 0
+    assert revealed == len(changed) == 10
+    assert board.pending
+
+    while board.pending:
+        _, revealed, _ = board.reveal(50, 50, limit = 10)
+        assert 0 < revealed <= 10
+
+    full: ChunkedBoard = ChunkedBoard(1, 0.02, 16, (50, 50), rows = 200, cols = 200)
+    full.reveal(50, 50)
+    assert opened(board, 200, 200) == opened(full, 200, 200)
+
+
+def test_limited_reveal_leaves_no_zero_unexpanded():
+    board: ChunkedBoard = ChunkedBoard(2, 0.05, 8, (20, 20), rows = 40, cols = 40)
+    board.reveal(20, 20, limit = 7)
+    board.expand()
+    for x, y in opened(board, 40, 40):
+        if board.value(x, y) == 0:
+            assert all(board.is_revealed(a, b) for a in range(max(0, x - 1), min(40, x + 2))
+                       for b in range(max(0, y - 1), min(40, y + 2)))
+
+
+def test_bounded_board_mine_count():
+    board: ChunkedBoard = ChunkedBoard(3, 0.2, 16, (0, 0), rows = 37, cols = 50)
+    assert board.number_of_mines() == sum(board.is_mine(x, y) for x in range(37) for y in range(50))
+    assert not any(board.is_mine(x, 50) or board.is_mine(37, y) for x in range(38) for y in range(51))
+
+
+def test_chunked_game_is_won_with_a_reveal_limit():
+    game: ChunkedGame = ChunkedGame(30, 45, 0.15, 4, tile_size = 8, reveal_limit = 20)
+    game.apply(("r", 15, 20))
+    cells = [(x, y) for x in range(30) for y in range(45)]
+    for x, y in cells:
+        if game.board.is_mine(x, y):
+            game.apply(("f", x, y))
+    for x, y in cells:
+        if game.result == 0 and not game.board.is_mine(x, y):
+            game.apply(("r", x, y))
+    while game.result == 0:
+        game.apply(("r", 15, 20))
+    assert game.result == 1
+    assert game.remaining == 0
+    assert game.flags == game.num_mines
@@ -0,0 +1,22 @@
+from pyminesweeper.board import MINE
+from pyminesweeper.generate import GenerateOptions, board_seed, click_seed, generate_board, map_name
+from pyminesweeper.minesweepermap import MinesweeperMap
+
+
+def test_random_first_click_has_its_own_seed():
+    assert click_seed(7, 3) != board_seed(7, 3)
+    options: GenerateOptions = GenerateOptions(16, 30, 0.2, 7, "maps", first_click = "random")
+    first: MinesweeperMap = generate_board(options, 3)
+    again: MinesweeperMap = generate_board(options, 3)
+    assert first.board.values.tobytes() == again.board.values.tobytes()
+    assert first.seed == board_seed(7, 3)
+    assert first.board.values.count(MINE) == first.num_mines
+
+
+def test_runs_with_different_settings_use_different_names():
+    options: GenerateOptions = GenerateOptions(9, 9, 0.15, 0, "maps")
+    names = {map_name(options, 0), map_name(options._replace(rows = 20, cols = 20), 0),
+             map_name(options._replace(density = 0.2), 0), map_name(options._replace(no_guess = True), 0),
+             map_name(options._replace(first_click = "random"), 0), map_name(options._replace(fmt = "binary"), 0)}
+    assert len(names) == 6
+    assert map_name(options, 3) == "map-9x9-0.15-0-000003.txt"
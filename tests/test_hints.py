@@ -0,0 +1,45 @@
+from array import array
+from typing import List
+
+import pytest
+
+from pyminesweeper.board import MINE
+from pyminesweeper.hints import _compute_hints_numpy, _compute_hints_python, load_numpy
+from pyminesweeper.placement import number_of_mines, place_mines
+
+SHAPES: List = [(1, 1), (1, 9), (9, 1), (2, 2), (3, 7), (16, 30), (30, 16), (50, 50)]
+
+
+def reference(values: array, rows: int, cols: int) -> array:
+    # The old per-cell count over each cell's 3x3 neighborhood.
+    hints: array = array("b", values)
+    x: int
+    y: int
+    for x in range(rows):
+        for y in range(cols):
+            if values[x * cols + y] != MINE:
+                hints[x * cols + y] = sum(values[a * cols + b] == MINE
+                                          for a in range(max(0, x - 1), min(rows, x + 2))
+                                          for b in range(max(0, y - 1), min(cols, y + 2)))
+    return hints
+
+
+def mines(rows: int, cols: int, density: float, seed: int) -> array:
+    values: array = array("b", bytes(rows * cols))
+    i: int
+    for i in place_mines(rows, cols, number_of_mines(rows, cols, density), seed = seed):
+        values[i] = MINE
+    return values
+
+
+@pytest.mark.parametrize("rows, cols", SHAPES)
+@pytest.mark.parametrize("density", [0.1, 0.3, 0.8])
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_hints_match_the_per_cell_count(rows: int, cols: int, density: float, seed: int, use_numpy: bool):
+    if use_numpy and load_numpy() is None:
+        pytest.skip("NumPy is not installed")
+    values: array = mines(rows, cols, density, seed)
+    expected: array = reference(values, rows, cols)
+    (_compute_hints_numpy if use_numpy else _compute_hints_python)(values, rows, cols)
+    assert values == expected
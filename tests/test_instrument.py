@@ -0,0 +1,43 @@
+from pyminesweeper import instrument, minesweepermap
+from pyminesweeper.board import MINE
+from pyminesweeper.generate import GenerateOptions, write_board
+from pyminesweeper.minesweepermap import MinesweeperMap
+
+
+def test_enable_wraps_batches_and_chords():
+    apply_batch = MinesweeperMap.apply_batch
+    chord_cells = minesweepermap.chord_cells
+    instrument.reset()
+    instrument.enable()
+    try:
+        assert MinesweeperMap.apply_batch is not apply_batch
+        assert minesweepermap.chord_cells is not chord_cells
+        game: MinesweeperMap = MinesweeperMap(9, 0.15, 2)
+        game.new_game((4, 4))
+        values = game.board.values
+        i: int
+        for i in range(81):
+            if values[i] == MINE:
+                game.apply(("f",) + divmod(i, 9))
+        game.apply(("c", 4, 4))
+        game.apply_batch([("r",) + divmod(i, 9) for i in range(81) if values[i] != MINE])
+        stats = instrument.stats()
+        assert stats["apply_batch"]["calls"] == 2
+        assert stats["minesweepermap.chord_cells"]["calls"] == 1
+    finally:
+        instrument.disable()
+        instrument.reset()
+    assert MinesweeperMap.apply_batch is apply_batch
+    assert minesweepermap.chord_cells is chord_cells
+
+
+def test_enable_times_binary_writes_from_generate(tmp_path):
+    instrument.reset()
+    instrument.enable()
+    try:
+        options: GenerateOptions = GenerateOptions(9, 9, 0.15, 0, str(tmp_path), fmt = "binary")
+        assert write_board(options, 0) > 0
+        assert instrument.stats()["export.write_binary"]["calls"] == 1
+    finally:
+        instrument.disable()
+        instrument.reset()
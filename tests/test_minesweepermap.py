@@ -0,0 +1,43 @@
+import pytest
+
+from pyminesweeper.board import MINE
+from pyminesweeper.minesweepermap import MinesweeperMap
+from pyminesweeper.neighbors import neighbor_table
+
+
+@pytest.mark.parametrize("move", [("r", -1, 0), ("r", 9, 0), ("f", 0, -1), ("c", 0, 9)])
+def test_apply_rejects_moves_off_the_board(move):
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 1)
+    with pytest.raises(ValueError):
+        game.apply(move)
+    with pytest.raises(ValueError):
+        game.apply_batch([move])
+
+
+def test_new_game_starts_over():
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 1)
+    game.new_game((4, 4))
+    values: bytes = game.board.values.tobytes()
+    game.apply(("f", 0, 0))
+    game.apply(("r", 0, 8))
+    game.new_game((4, 4))
+    assert game.board.values.tobytes() == values
+    assert sum(v == MINE for v in game.board.values) == game.num_mines
+    assert (game.turns, game.flags, game.lives) == (1, 0, 3)
+
+
+def test_changed_cells_use_four_byte_indices():
+    game: MinesweeperMap = MinesweeperMap(30, 0.1, 1)
+    game.new_game((15, 15))
+    assert game.last_changed.itemsize == 4
+    assert game.apply(("f", 0, 0)).changed.itemsize == 4
+    assert game.apply_batch([("r", 15, 15), ("f", 0, 1)]).changed.itemsize == 4
+
+
+def test_reveal_and_hints_build_no_neighbor_table():
+    neighbor_table.cache_clear()
+    game: MinesweeperMap = MinesweeperMap(200, 0.05, 1)
+    game.new_game((100, 100))
+    game.apply(("c", 100, 100))
+    assert game.nearby_bombs(0, 0) == game.board.values[0] or game.board.values[0] == MINE
+    assert neighbor_table.cache_info().currsize == 0
@@ -0,0 +1,53 @@
+from array import array
+
+from pyminesweeper.noguess import ReadyBoard, generate_ready, orient, solve, symmetries
+from pyminesweeper.minesweepermap import MinesweeperMap
+from pyminesweeper.replay import MoveLog, Replay, record
+
+
+def test_orient_covers_clicks_outside_the_opening():
+    board: ReadyBoard = generate_ready(9, 9, 0.15, 5)
+    hits: int = 0
+    x: int
+    y: int
+    for x in range(9):
+        for y in range(9):
+            turned = orient(board, x, y)
+            if turned is None:
+                continue
+            hits += 1
+            assert x * 9 + y in turned.opening
+            assert sorted(turned.values) == sorted(board.values)
+            assert solve(9, 9, array("b", turned.values), x, y)[0].result == 1
+    assert hits > len(board.opening)
+
+
+def test_only_square_boards_are_transposed():
+    assert len(symmetries(9, 9)) == 8
+    assert len(symmetries(16, 30)) == 4
+    board: ReadyBoard = generate_ready(16, 30, 0.2, 7)
+    i: int
+    for i in board.opening:
+        assert orient(board, *divmod(i, 30)) is board
+
+
+class OnePool:
+    # Deals one pre-generated board, the way BoardPool.take does.
+    def __init__(self, board: ReadyBoard):
+        self.board: ReadyBoard = board
+
+    def take(self, rows: int, cols: int, density: float, x: int, y: int):
+        return orient(self.board, x, y)
+
+
+def test_replay_rebuilds_a_turned_board(tmp_path):
+    board: ReadyBoard = generate_ready(9, 9, 0.15, 5)
+    x, y = next((x, y) for x in range(9) for y in range(9)
+                if x * 9 + y not in board.opening and orient(board, x, y) is not None)
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 1, pool = OnePool(board))
+    log: MoveLog = record(game, str(tmp_path / "game.log"))
+    game.apply(("r", x, y))
+    log.close()
+    replay: Replay = Replay((tmp_path / "game.log").read_bytes())
+    replay.seek(1)
+    assert replay.game.board.values.tobytes() == game.board.values.tobytes()
@@ -0,0 +1,5 @@
+import pyminesweeper
+
+
+def test_dir_lists_only_the_public_names():
+    assert dir(pyminesweeper) == ["MinesweeperMap", "MinesweeperUI"]
@@ -0,0 +1,23 @@
+from pyminesweeper.minesweepermap import MinesweeperMap, MoveResult
+from pyminesweeper.probability import ProbabilityEngine
+from pyminesweeper.solver import Solver
+
+
+def test_incremental_queries_match_a_fresh_engine():
+    queries: int = 0
+    seed: int
+    for seed in range(20):
+        game: MinesweeperMap = MinesweeperMap(16, 99 / 480, seed, cols = 30)
+        solver: Solver = Solver(game)
+        result: MoveResult = game.new_game((8, 15))
+        while result.result == 0:
+            solver.update(result.changed)
+            move = solver.next_move()
+            if move is None:
+                fresh: ProbabilityEngine = ProbabilityEngine(solver)
+                fresh.invalidate(range(len(game.board)))
+                assert solver.engine.probabilities() == fresh.probabilities()
+                queries += 1
+                move = solver.guess()
+            result = game.apply(move)
+    assert queries > 0
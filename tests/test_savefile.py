@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from pyminesweeper.board import MINE
+from pyminesweeper.minesweepermap import MinesweeperMap
+from pyminesweeper.savefile import INDEX_NAME, list_saves, load_game, save_game, save_to_directory
+
+
+def test_save_keeps_the_no_guess_flag(tmp_path):
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 3, no_guess = True)
+    game.apply(("r", 4, 4))
+    save_game(game, str(tmp_path / "game.save"))
+    loaded: MinesweeperMap = load_game(str(tmp_path / "game.save"))
+    assert loaded.no_guess
+    assert bytes(loaded.board.values) == bytes(game.board.values)
+    assert bytes(loaded.board.states) == bytes(game.board.states)
+
+
+def test_save_keeps_the_result(tmp_path):
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 3)
+    game.new_game((4, 4))
+    game.apply_batch([("r",) + divmod(i, 9) for i in range(81) if game.board.values[i] != MINE])
+    assert game.result == 1
+    save_game(game, str(tmp_path / "game.save"))
+    assert load_game(str(tmp_path / "game.save")).result == 1
+
+
+def test_short_file_is_rejected(tmp_path):
+    (tmp_path / "short.save").write_bytes(b"PMSV\x03")
+    with pytest.raises(ValueError):
+        load_game(str(tmp_path / "short.save"))
+
+
+def test_saving_a_loaded_game_replaces_its_save(tmp_path):
+    game: MinesweeperMap = MinesweeperMap(9, 0.15, 3)
+    game.new_game((4, 4))
+    path: str = save_to_directory(game, str(tmp_path))
+    name: str = os.path.basename(path)
+    loaded: MinesweeperMap = load_game(path)
+    loaded.apply(("f", 0, 0))
+    assert save_to_directory(loaded, str(tmp_path), name) == path
+    saves = list_saves(str(tmp_path))
+    assert [save["name"] for save in saves] == [name]
+    assert saves[0]["turns"] == 2
+    assert sorted(os.listdir(str(tmp_path))) == sorted([name, INDEX_NAME])
+    assert load_game(path).turns == 2